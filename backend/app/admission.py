@@ -0,0 +1,176 @@
+import asyncio
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional
+from starlette.responses import JSONResponse
+from config import settings
+
+# Paths under the API prefix that are never throttled; the long-lived change
+# feed is capped per user by events.py instead of holding a read slot
+EXEMPT_PREFIXES = ("/api/v1/docs", "/api/v1/redoc", "/api/v1/openapi.json", "/api/v1/students/events")
+# POST endpoints that only read
+READ_POSTS = {"/api/v1/students/batch"}
+
+
+class RequestState:
+    """Per-request flags for code that cannot see the ASGI scope (e.g. SQLite progress handlers)"""
+
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+
+_NEVER_CANCELLED = RequestState()
+_current: ContextVar[RequestState] = ContextVar("request_state", default=_NEVER_CANCELLED)
+
+
+def current_request() -> RequestState:
+    return _current.get()
+
+
+def overloaded(detail: str) -> JSONResponse:
+    """503 telling the client to back off and retry"""
+    return JSONResponse(
+        {"detail": detail},
+        status_code=503,
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)},
+    )
+
+
+def route_class(scope) -> Optional[str]:
+    """auth | read | write, or None for requests admission control ignores"""
+    path = scope["path"]
+    method = scope["method"]
+    if not path.startswith("/api/v1/") or path.startswith(EXEMPT_PREFIXES) or method == "OPTIONS":
+        return None
+    if method == "POST" and path.startswith("/api/v1/auth/"):
+        return "auth"
+    if method in ("GET", "HEAD") or (method == "POST" and path in READ_POSTS):
+        return "read"
+    return "write"
+
+
+class Gate:
+    """Caps concurrent requests of one class; a few more may wait briefly for a slot"""
+
+    def __init__(self, name: str, limit: int, queue_size: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.in_flight = 0
+        self.shed = 0
+        self._waiters: deque = deque()
+
+    async def enter(self) -> bool:
+        """Take a slot, waiting up to ADMISSION_QUEUE_TIMEOUT; False when shed"""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return True
+        if len(self._waiters) >= self.queue_size:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, settings.ADMISSION_QUEUE_TIMEOUT)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we gave up; pass it on
+                self.leave()
+            elif waiter in self._waiters:
+                # leave() may already have dropped it while wait_for was cancelling it
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self.shed += 1
+                return False
+            raise
+        return True
+
+    def leave(self) -> None:
+        # Hand the slot straight to the oldest waiter so in_flight never dips below the limit
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {"limit": self.limit, "in_flight": self.in_flight, "waiting": len(self._waiters), "shed": self.shed}
+
+
+gates = {
+    "auth": Gate("auth", settings.ADMISSION_AUTH_LIMIT, settings.ADMISSION_QUEUE_SIZE),
+    "read": Gate("read", settings.ADMISSION_READ_LIMIT, settings.ADMISSION_QUEUE_SIZE),
+    "write": Gate("write", settings.ADMISSION_WRITE_LIMIT, settings.ADMISSION_QUEUE_SIZE),
+}
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware bounding concurrent work per route class.
+
+    Requests over their class's limit wait at most ADMISSION_QUEUE_TIMEOUT for
+    a slot and are otherwise answered 503 straight away. Admitted requests run
+    in their own task, which is cancelled if the client disconnects before the
+    response is complete.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        gate = gates.get(route_class(scope)) if scope["type"] == "http" else None
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await gate.enter():
+            await overloaded("Server is busy, please retry shortly")(scope, receive, send)
+            return
+        try:
+            await self._run_cancellable(scope, receive, send)
+        finally:
+            gate.leave()
+
+    async def _run_cancellable(self, scope, receive, send):
+        state = RequestState()
+        token = _current.set(state)
+        messages: asyncio.Queue = asyncio.Queue()
+        response_complete = False
+
+        async def send_tracking(message):
+            nonlocal response_complete
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        # The app reads the request from `messages`; we own `receive` so a
+        # disconnect is seen even while the app is busy in the database
+        task = asyncio.create_task(self.app(scope, messages.get, send_tracking))
+        try:
+            while True:
+                receiving = asyncio.ensure_future(receive())
+                await asyncio.wait({task, receiving}, return_when=asyncio.FIRST_COMPLETED)
+                if task.done():
+                    receiving.cancel()
+                    break
+                message = receiving.result()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    # After the response, a disconnect is normal and background tasks must finish
+                    if not response_complete:
+                        state.cancelled = True
+                        scope["client_disconnected"] = True
+                        task.cancel()
+                    break
+            try:
+                await task
+            except asyncio.CancelledError:
+                if not state.cancelled:
+                    raise
+        finally:
+            if not task.done():
+                task.cancel()
+            _current.reset(token)
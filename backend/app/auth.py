@@ -1,38 +1,28 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from config import settings
-from database import get_db
+from database import get_read_db, AsyncReadSessionLocal, AsyncSessionLocal
 from models import User
 from schemas import TokenData
-
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from principals import UserSnapshot, principal_cache
+from metrics import phase
+from hashing import (
+    pwd_context,
+    verify_password,
+    get_password_hash,
+    verify_password_async,
+    get_password_hash_async
+)
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    # Truncate password if too long for bcrypt (72 bytes limit)
-    if len(plain_password.encode('utf-8')) > 72:
-        plain_password = plain_password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    # Truncate password if too long for bcrypt (72 bytes limit)
-    if len(password.encode('utf-8')) > 72:
-        password = password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
-    return pwd_context.hash(password)
-
-
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -53,41 +43,79 @@ def decode_token(token: str) -> Optional[TokenData]:
         if user_id_str is None:
             return None
         user_id = int(user_id_str)  # Convert string back to int
-        return TokenData(user_id=user_id)
+        return TokenData(user_id=user_id, exp=payload.get("exp"))
     except (JWTError, ValueError):
         return None
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_read_db)
+) -> UserSnapshot:
     """Get the current authenticated user from the JWT token"""
+    with phase("auth"):
+        return await _resolve_principal(credentials.credentials, db)
+
+
+async def get_stream_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserSnapshot:
+    """Like get_current_user, for long-lived responses: the session used to load
+    the user is closed before the endpoint runs, so an open stream holds no connection"""
+    with phase("auth"):
+        async with AsyncReadSessionLocal() as db:
+            return await _resolve_principal(credentials.credentials, db)
+
+
+async def _resolve_principal(token: str, db: AsyncSession) -> UserSnapshot:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    token = credentials.credentials
+    # Tokens verified earlier skip the signature check and the user lookup
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    
     token_data = decode_token(token)
     
     if token_data is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user = await db.get(User, token_data.user_id)
     
     if user is None:
         raise credentials_exception
     
-    return user
+    principal = UserSnapshot.from_user(user)
+    principal_cache.put(token, principal, token_data.exp)
+    return principal
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """Authenticate a user by email and password"""
-    user = db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    # Give the connection back to the pool while bcrypt runs
+    db.expunge(user)
+    await db.rollback()
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
+
+
+async def rehash_password(user_id: int, password: str) -> None:
+    """Re-hash a password with the current settings after a successful login"""
+    try:
+        hashed_password = await get_password_hash_async(password)
+    except HTTPException:
+        # Hashing pool is saturated; try again on a later login
+        return
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(User).where(User.id == user_id).values(hashed_password=hashed_password)
+        )
+        await db.commit()
+    principal_cache.invalidate_user(user_id)
@@ -0,0 +1,14 @@
+"""In-process load and latency benchmark for the backend.
+
+Seeds a throwaway SQLite database, drives `main.app` over an ASGI transport
+(no network) with a weighted mix of realistic client flows and reports
+throughput and p50/p95/p99 per endpoint. Results can be written as JSON and
+compared against a saved baseline.
+
+Usage (from backend/app):
+    python -m bench [--users 20] [--students 2000] [--clients 50] [--duration 20]
+                    [--output results.json] [--baseline baseline.json]
+
+The app reads its settings at import time, so everything that imports app
+modules is loaded only after the CLI has configured the environment.
+"""
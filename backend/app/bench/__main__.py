@@ -0,0 +1,73 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bench
+from bench.report import compare, load, print_comparison, print_summary, save, summarize
+
+
+def parse_mix(value: str) -> dict:
+    """Parse 'flow=weight,...' on top of the default mix"""
+    from bench.scenarios import DEFAULT_MIX
+
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, value.split(",")):
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown flow {name!r}; expected one of {', '.join(DEFAULT_MIX)}")
+        mix[name] = int(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m bench", description=bench.__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=20, help="Seeded users")
+    parser.add_argument("--students", type=int, default=2000, help="Seeded students per user")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of measured load")
+    parser.add_argument("--mix", type=parse_mix, default="", help="Flow weights, e.g. 'write=0,search=30'")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for data and client choices")
+    parser.add_argument("--database", help="SQLite file to use (default: a temporary file)")
+    parser.add_argument("--output", help="Write the summary as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against a summary saved with --output")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed regression vs baseline (fraction)")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    database = args.database or os.path.join(tmp.name, "bench.db")
+    if os.path.exists(database):
+        parser.error(f"{database} already exists; the benchmark seeds a fresh database")
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    # All virtual users share the in-process client address
+    os.environ["AUTH_RATE_LIMIT_ENABLED"] = "false"
+
+    from bench.seed import seed
+    from bench.scenarios import run
+
+    users = seed(args.users, args.students, args.seed)
+
+    import main as app_main
+    result = asyncio.run(run(app_main.app, users, args.clients, args.duration, args.mix, args.seed))
+
+    config = {key: getattr(args, key) for key in ("users", "students", "clients", "duration", "mix", "seed")}
+    summary = summarize(result, config)
+    print_summary(summary)
+    if args.output:
+        save(summary, args.output)
+
+    baseline = load(args.baseline)
+    if baseline is not None:
+        regressions = compare(summary, baseline, args.threshold)
+        print_comparison(summary, baseline, regressions, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import json
+import statistics
+from typing import Optional
+
+TOTAL = "TOTAL"
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _stats(samples: list, errors: int, elapsed: float) -> dict:
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "throughput": len(samples) / elapsed,
+        "p50_ms": statistics.median(samples),
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+    }
+
+
+def summarize(result: dict, config: dict) -> dict:
+    """Turn raw samples into the per-endpoint summary written as JSON"""
+    elapsed = result["elapsed"]
+    endpoints = {
+        label: _stats(samples, result["errors"].get(label, 0), elapsed)
+        for label, samples in sorted(result["samples"].items())
+    }
+    every_sample = [sample for samples in result["samples"].values() for sample in samples]
+    if every_sample:
+        endpoints[TOTAL] = _stats(every_sample, sum(result["errors"].values()), elapsed)
+    return {"config": config, "elapsed_s": elapsed, "endpoints": endpoints}
+
+
+def print_summary(summary: dict) -> None:
+    print(f"{summary['elapsed_s']:.1f}s, config: {json.dumps(summary['config'], sort_keys=True)}")
+    print(f"{'endpoint':<28} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for label, stats in summary["endpoints"].items():
+        print(
+            f"{label:<28} {stats['requests']:>9} {stats['errors']:>7} {stats['throughput']:>9.1f} "
+            f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}"
+        )
+
+
+def compare(summary: dict, baseline: dict, threshold: float) -> list:
+    """Return (label, metric, baseline, current, change) rows worse than `threshold`.
+
+    Latency regresses when it grows and throughput when it shrinks by more
+    than `threshold` (a fraction, e.g. 0.1 for 10%).
+    """
+    regressions = []
+    for label, stats in summary["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(label)
+        if before is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput"):
+            old, new = before[metric], stats[metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            worse = change < -threshold if metric == "throughput" else change > threshold
+            if worse:
+                regressions.append((label, metric, old, new, change))
+    return regressions
+
+
+def print_comparison(summary: dict, baseline: dict, regressions: list, threshold: float) -> None:
+    if baseline.get("config") != summary["config"]:
+        print("warning: baseline was recorded with a different configuration")
+    print(f"\nvs baseline (threshold {threshold:.0%}):")
+    print(f"{'endpoint':<28} {'p95 ms':>17} {'req/s':>19}")
+    for label, stats in summary["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(label)
+        if before is None:
+            print(f"{label:<28} {'(new)':>17}")
+            continue
+        print(
+            f"{label:<28} {before['p95_ms']:>7.1f} -> {stats['p95_ms']:<7.1f} "
+            f"{before['throughput']:>8.1f} -> {stats['throughput']:<8.1f}"
+        )
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for label, metric, old, new, change in regressions:
+            print(f"  {label} {metric}: {old:.1f} -> {new:.1f} ({change:+.0%})")
+    else:
+        print("\nno regressions")
+
+
+def load(path: Optional[str]) -> Optional[dict]:
+    if not path:
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(summary: dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(summary, f, indent=2, sort_keys=True)
+        f.write("\n")
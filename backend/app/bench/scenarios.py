@@ -0,0 +1,166 @@
+import asyncio
+import itertools
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Optional
+import httpx
+from bench.seed import CITIES, COURSES, FIRST_NAMES
+
+API = "/api/v1"
+LOGIN_ATTEMPTS = 30
+SORT_FIELDS = ["name", "email", "age", "course", "city", "created_at", "updated_at"]
+
+# Relative weight of each client flow in the default mix
+DEFAULT_MIX = {
+    "login": 2,
+    "dashboard": 10,
+    "browse": 40,
+    "search": 15,
+    "detail": 13,
+    "write": 20,
+}
+
+_emails = itertools.count()
+
+
+class Recorder:
+    """Latency samples (ms) and failures keyed by 'METHOD /route'"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+
+    def add(self, label: str, elapsed_ms: float, ok: bool) -> None:
+        self.samples[label].append(elapsed_ms)
+        if not ok:
+            self.errors[label] += 1
+
+
+class VirtualUser:
+    """One simulated client session acting for a seeded user"""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, credentials: dict, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.credentials = credentials
+        self.rng = rng
+        self.headers = {}
+        self.seen_ids = []
+        self.last_response: Optional[httpx.Response] = None
+
+    async def request(self, label: str, method: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, API + path, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.add(label, (time.perf_counter() - start) * 1000, False)
+            return None
+        self.last_response = response
+        self.recorder.add(label, (time.perf_counter() - start) * 1000, response.is_success)
+        return response if response.is_success else None
+
+    async def login(self) -> None:
+        for _ in range(LOGIN_ATTEMPTS):
+            response = await self.request("POST /auth/login", "POST", "/auth/login", json={
+                "email": self.credentials["email"], "password": self.credentials["password"]
+            })
+            if response is not None:
+                self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+                return
+            # Back off like a real client when throttled or the hashing queue is full
+            if self.last_response is None or self.last_response.status_code not in (429, 503):
+                return
+            await asyncio.sleep(float(self.last_response.headers.get("retry-after", 1)))
+
+    async def dashboard(self) -> None:
+        # What the frontend fetches when the dashboard loads
+        await self.request("GET /auth/verify", "GET", "/auth/verify")
+        await self.request("GET /auth/me", "GET", "/auth/me")
+        await self.request("GET /students/summary", "GET", "/students/summary", params={"recent": 5})
+
+    async def browse(self) -> None:
+        params = {
+            "page_size": self.rng.choice([10, 20, 50]),
+            "sort_by": self.rng.choice(SORT_FIELDS),
+            "sort_order": self.rng.choice(["asc", "desc"]),
+        }
+        if self.rng.random() < 0.3:
+            params["course"] = self.rng.choice(COURSES)
+        if self.rng.random() < 0.3:
+            params["city"] = self.rng.choice(CITIES)
+        page = await self.list_page({**params, "page": self.rng.randint(1, 5)})
+        # Some users keep scrolling with the cursor
+        for _ in range(self.rng.randint(0, 3)):
+            if not page or not page["next_cursor"]:
+                break
+            page = await self.list_page({**params, "cursor": page["next_cursor"]})
+
+    async def search(self) -> None:
+        term = self.rng.choice([*FIRST_NAMES, *CITIES, *COURSES]).split()[0].lower()[: self.rng.randint(3, 6)]
+        params = {"search": term, "page_size": 20}
+        if self.rng.random() < 0.5:
+            params["sort_by"] = "relevance"
+        await self.list_page(params)
+
+    async def detail(self) -> None:
+        if not self.seen_ids:
+            await self.list_page({"page_size": 20})
+        if self.seen_ids:
+            await self.request("GET /students/{id}", "GET", f"/students/{self.rng.choice(self.seen_ids)}")
+
+    async def write(self) -> None:
+        # Create, edit and remove a student so the data set stays the same size
+        response = await self.request("POST /students", "POST", "/students", json={
+            "name": f"{self.rng.choice(FIRST_NAMES)} Bench",
+            "email": f"bench-write-{next(_emails)}@example.com",
+            "age": self.rng.randint(17, 30),
+            "course": self.rng.choice(COURSES),
+            "city": self.rng.choice(CITIES),
+        })
+        if response is None:
+            return
+        student_id = response.json()["id"]
+        await self.request("PUT /students/{id}", "PUT", f"/students/{student_id}", json={
+            "city": self.rng.choice(CITIES), "age": self.rng.randint(17, 30)
+        })
+        await self.request("DELETE /students/{id}", "DELETE", f"/students/{student_id}")
+
+    async def list_page(self, params: dict) -> Optional[dict]:
+        response = await self.request("GET /students", "GET", "/students", params=params)
+        if response is None:
+            return None
+        page = response.json()
+        self.seen_ids = [student["id"] for student in page["students"]] or self.seen_ids
+        return page
+
+
+async def run(app, users: list, clients: int, duration: float, mix: dict, rng_seed: int = 0) -> dict:
+    """Drive `app` with `clients` concurrent virtual users for `duration` seconds"""
+    recorder = Recorder()
+    flows, weights = zip(*((name, weight) for name, weight in mix.items() if weight > 0))
+    # Unhandled errors become 500s and count as failures instead of stopping the run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        sessions = [
+            VirtualUser(client, recorder, users[i % len(users)], random.Random(rng_seed + i))
+            for i in range(clients)
+        ]
+        # Every session signs in once before the clock starts
+        await asyncio.gather(*(session.login() for session in sessions))
+        recorder.samples.clear()
+        recorder.errors.clear()
+
+        deadline = time.perf_counter() + duration
+
+        async def loop(session: VirtualUser):
+            while time.perf_counter() < deadline:
+                flow = session.rng.choices(flows, weights)[0]
+                await getattr(session, flow)()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(loop(session) for session in sessions))
+        elapsed = time.perf_counter() - started
+
+    return {"elapsed": elapsed, "samples": dict(recorder.samples), "errors": dict(recorder.errors)}
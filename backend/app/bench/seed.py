@@ -0,0 +1,58 @@
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import insert, text
+
+PASSWORD = "bench-password"
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Kavya", "Rohan", "Sneha", "Vikram", "Ananya", "Arjun", "Meera"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Reddy", "Gupta", "Nair", "Joshi", "Kulkarni", "Das", "Singh"]
+COURSES = ["Computer Science", "Mechanical", "Electronics", "Civil", "Mathematics", "Physics", "Biology"]
+CITIES = ["Pune", "Mumbai", "Delhi", "Bengaluru", "Chennai", "Hyderabad", "Kolkata", "Jaipur"]
+BATCH_SIZE = 10000
+
+
+def user_email(user_id: int) -> str:
+    return f"bench{user_id}@example.com"
+
+
+def seed(users: int, students_per_user: int, rng_seed: int = 0) -> list[dict]:
+    """Create the schema and fill it; returns the seeded users' credentials"""
+    from database import engine
+    from facets import rebuild_facets
+    from hashing import get_password_hash
+    from migrations import init_db
+    from models import User, Student
+
+    init_db()  # the ASGI transport does not run the app's lifespan
+    rng = random.Random(rng_seed)
+    # Every user shares one hash: the cost under test is verifying it at login
+    hashed = get_password_hash(PASSWORD)
+    now = datetime.utcnow()
+
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": user_id, "email": user_email(user_id), "name": f"Bench {user_id}", "hashed_password": hashed}
+            for user_id in range(1, users + 1)
+        ])
+        batch = []
+        for i in range(users * students_per_user):
+            created_at = now - timedelta(minutes=i)
+            batch.append({
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "email": f"student{i}@example.com",
+                "age": rng.randint(17, 30),
+                "course": rng.choice(COURSES),
+                "city": rng.choice(CITIES),
+                "created_by": 1 + i % users,
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+            if len(batch) == BATCH_SIZE:
+                conn.execute(insert(Student), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Student), batch)
+        rebuild_facets(conn)
+        if engine.dialect.name == "sqlite":
+            conn.execute(text("ANALYZE"))
+
+    return [{"id": user_id, "email": user_email(user_id), "password": PASSWORD} for user_id in range(1, users + 1)]
@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+from typing import List
+from fastapi import HTTPException, Request, status
+from pydantic import ValidationError
+from config import settings
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+async def read_bulk_records(request: Request) -> List[dict]:
+    """Parse a bulk payload sent as a JSON array, NDJSON or a multipart CSV upload"""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type == "multipart/form-data":
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or not hasattr(upload, "read"):
+            raise _bad_request("Expected a CSV file in the 'file' form field")
+        try:
+            text = (await upload.read()).decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise _bad_request("Body must be UTF-8")
+        records = list(csv.DictReader(io.StringIO(text)))
+    elif content_type in ("application/x-ndjson", "application/ndjson"):
+        try:
+            body = (await request.body()).decode("utf-8")
+        except UnicodeDecodeError:
+            raise _bad_request("Body must be UTF-8")
+        try:
+            records = [json.loads(line) for line in body.splitlines() if line.strip()]
+        except ValueError:
+            raise _bad_request("Invalid NDJSON body")
+    else:
+        try:
+            records = json.loads(await request.body())
+        except ValueError:
+            raise _bad_request("Invalid JSON body")
+        if not isinstance(records, list):
+            raise _bad_request("Expected a JSON array of students")
+
+    if len(records) > settings.BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ROWS} rows can be imported per request"
+        )
+    return records
+
+
+def validation_messages(error: ValidationError) -> List[str]:
+    """Flatten a pydantic ValidationError into 'field: message' strings"""
+    return [
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    ]
@@ -0,0 +1,49 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional
+from fastapi import Request, Response, status
+from result_cache import result_cache
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag derived from the parts that determine a response body"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match (weak comparison) against the current ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == current for candidate in header.split(","))
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    """Validator headers; responses are per user and must be revalidated before reuse"""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            # Timestamps are stored as naive UTC
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+
+def not_modified(headers: dict) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+async def user_data_validators(user_id: int, namespace: str, params: tuple) -> tuple[str, str, dict]:
+    """Version, ETag and headers for a response derived from all of a user's students.
+
+    The version moves on every write by that user (see ResultCache.bump).
+    """
+    version, modified = await result_cache.version(user_id)
+    etag = make_etag(namespace, user_id, version, *params)
+    last_modified = datetime.fromtimestamp(modified, timezone.utc) if modified else None
+    return version, etag, cache_headers(etag, last_modified)
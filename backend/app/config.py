@@ -10,10 +10,95 @@ class Settings(BaseSettings):
     # SQLite (default fallback)
     DATABASE_URL: str = "sqlite:///./student_management.db"
     
+    # Create the database, tables and indexes when the app starts. Turn off when
+    # many workers boot at once and run `python scripts/init_db.py` on deploy instead
+    INIT_DB_ON_STARTUP: bool = True
+
+    # SQLite tuning: "default" keeps the driver defaults; "production" enables WAL,
+    # tuned pragmas, a read-only pool for GET endpoints and a single-writer queue
+    SQLITE_PROFILE: str = "default"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64000  # negative = KiB
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_READ_POOL_SIZE: int = 8
+    SQLITE_WRITE_QUEUE_TIMEOUT: int = 30  # seconds a write waits for the writer connection
+    
+    # Bound database waits: pool checkouts and statements past these answer 503
+    DB_POOL_TIMEOUT: float = 5  # seconds; the SQLite production writer uses SQLITE_WRITE_QUEUE_TIMEOUT
+    DB_STATEMENT_TIMEOUT_MS: int = 5000  # request statements only (not streamed exports); 0 disables
+
+    # Admission control: concurrent requests per route class; excess requests wait
+    # up to ADMISSION_QUEUE_TIMEOUT in a bounded queue, then get 503
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_AUTH_LIMIT: int = 16
+    ADMISSION_READ_LIMIT: int = 64
+    ADMISSION_WRITE_LIMIT: int = 16
+    ADMISSION_QUEUE_SIZE: int = 64  # waiting requests per class
+    ADMISSION_QUEUE_TIMEOUT: float = 1.0  # seconds
+    ADMISSION_RETRY_AFTER: int = 1  # seconds
+    
     SECRET_KEY: str = "your-super-secret-key-change-in-production-min-32-chars"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
 
+    # Password hashing (bcrypt runs in a process pool off the event loop)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2  # 0 = use the default thread pool
+    PASSWORD_HASH_QUEUE_SIZE: int = 32  # waiting jobs before login/register answer 503
+    PASSWORD_HASH_RETRY_AFTER: int = 1  # seconds
+
+    # Token-bucket throttling of /auth/login and /auth/register, checked before any
+    # database or bcrypt work; over-budget attempts get 429 with Retry-After
+    AUTH_RATE_LIMIT_ENABLED: bool = True
+    AUTH_RATE_IP_BURST: int = 20
+    AUTH_RATE_IP_PER_MINUTE: float = 30
+    AUTH_RATE_EMAIL_BURST: int = 5
+    AUTH_RATE_EMAIL_PER_MINUTE: float = 5
+    AUTH_RATE_MAX_KEYS: int = 100000  # buckets kept per limiter; idle ones expire
+    AUTH_RATE_TRUST_FORWARDED_FOR: bool = False  # key by X-Forwarded-For behind a proxy
+
+    # Verified-token cache used by get_current_user
+    PRINCIPAL_CACHE_SIZE: int = 10000  # 0 disables the cache
+    PRINCIPAL_CACHE_TTL: int = 300  # seconds; bounds staleness across workers
+
+    # Rows fetched and encoded per chunk by the streaming export
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    # Bulk student import
+    BULK_BATCH_SIZE: int = 500  # rows per duplicate check / INSERT
+    BULK_MAX_ROWS: int = 10000
+
+    # Ids accepted by one GET/POST /students/batch request
+    BATCH_MAX_IDS: int = 100
+
+    # Cache of student list responses, invalidated per user on every write
+    RESULT_CACHE_BACKEND: str = "memory"  # memory | redis | none
+    RESULT_CACHE_URL: str = "redis://localhost:6379/1"  # redis backend only; dedicated DB
+    RESULT_CACHE_MAX_ENTRIES: int = 4096
+    RESULT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESULT_CACHE_TTL: int = 60  # seconds; bounds staleness across workers for the memory backend
+
+    DEBUG: bool = False  # adds X-Query-Count / X-Query-Time-Ms response headers
+
+    # SQL instrumentation (see query_stats.py)
+    SLOW_QUERY_MS: int = 200  # statements at least this slow are logged with their parameters
+    N_PLUS_ONE_THRESHOLD: int = 10  # executions of one statement shape per request before warning
+
+    # Background purge behind /admin/clear-db and /admin/purge
+    PURGE_CHUNK_SIZE: int = 1000  # ids per delete transaction
+    PURGE_CHUNK_PAUSE: float = 0.01  # seconds between chunks so live writes get the lock
+    PURGE_JOB_HISTORY: int = 20
+
+    # Server-sent change feed on /students/events (in-process, per worker)
+    EVENTS_BUFFER_SIZE: int = 256  # recent events kept per user for Last-Event-ID resume
+    EVENTS_MAX_USERS: int = 10000  # users with buffered events; idle ones are evicted first
+    EVENTS_MAX_CONNECTIONS_PER_USER: int = 5
+    EVENTS_QUEUE_SIZE: int = 1000  # undelivered events per stream before it is told to refetch
+    EVENTS_HEARTBEAT_SECONDS: float = 15
+
+    # Per-route latency, status and phase metrics served on /metrics
+    METRICS_ENABLED: bool = True
+
     class Config:
         # Load .env from the project root (backend/.env)
         env_file = str(ENV_PATH)
@@ -1,26 +1,27 @@
-from sqlalchemy import create_engine, text
+import math
+import time
+from sqlalchemy import create_engine, event, exc, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from config import settings
 from sqlalchemy.engine.url import make_url
+from admission import current_request
+from metrics import add_phase_time
+from query_stats import record_query
 
-# Ensure MySQL database exists, then configure engine based on database type
+# Async drivers used for request handling; the sync engine stays for DDL and scripts
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "mysql": "aiomysql",
+}
+
+# Configure engines based on database type. Engines connect lazily, so importing
+# this module does no I/O; see ensure_database() and migrations.init_db()
 url = make_url(settings.DATABASE_URL)
 
 if url.get_backend_name() == "mysql":
-    db_name = url.database
-    # Connect to built-in 'mysql' database to ensure CREATE DATABASE works
-    server_url = url.set(database="mysql")
-    try:
-        server_engine = create_engine(server_url, pool_pre_ping=True)
-        with server_engine.connect() as conn:
-            conn.execute(text(f"CREATE DATABASE IF NOT EXISTS `{db_name}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"))
-    finally:
-        try:
-            server_engine.dispose()
-        except Exception:
-            pass
-
     engine = create_engine(
         settings.DATABASE_URL,
         pool_pre_ping=True,
@@ -37,15 +38,223 @@ else:
         pool_pre_ping=True
     )
 
+
+def ensure_database() -> None:
+    """Create the configured MySQL database if it does not exist yet"""
+    if url.get_backend_name() != "mysql":
+        return
+    # Connect to built-in 'mysql' database to ensure CREATE DATABASE works
+    server_engine = create_engine(url.set(database="mysql"), pool_pre_ping=True)
+    try:
+        with server_engine.connect() as conn:
+            conn.execute(text(f"CREATE DATABASE IF NOT EXISTS `{url.database}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"))
+    finally:
+        server_engine.dispose()
+
+
+def get_async_url(sync_url):
+    """Swap the configured driver for its asyncio counterpart"""
+    driver = ASYNC_DRIVERS.get(sync_url.get_backend_name())
+    if driver is None:
+        # Assume the URL already names an async driver (e.g. postgresql+asyncpg)
+        return sync_url
+    return sync_url.set(drivername=f"{sync_url.get_backend_name()}+{driver}")
+
+
+if url.get_backend_name() == "mysql":
+    async_engine = create_async_engine(
+        get_async_url(url),
+        pool_pre_ping=True,
+        pool_recycle=300,
+        pool_timeout=settings.DB_POOL_TIMEOUT
+    )
+elif url.get_backend_name() == "sqlite" and settings.SQLITE_PROFILE == "production":
+    # One pooled connection is the single writer: write sessions queue for it
+    # in order instead of racing each other for the database lock
+    async_engine = create_async_engine(
+        get_async_url(url),
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.SQLITE_WRITE_QUEUE_TIMEOUT
+    )
+elif url.get_backend_name() == "sqlite":
+    async_engine = create_async_engine(get_async_url(url))
+else:
+    async_engine = create_async_engine(
+        get_async_url(url),
+        pool_pre_ping=True,
+        pool_timeout=settings.DB_POOL_TIMEOUT
+    )
+
+# GET endpoints read through their own pool; only the SQLite production
+# profile gives it separate (read-only) connections
+if url.get_backend_name() == "sqlite" and settings.SQLITE_PROFILE == "production":
+    async_read_engine = create_async_engine(
+        get_async_url(url),
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT
+    )
+else:
+    async_read_engine = async_engine
+
+
+def _sqlite_pragmas(query_only: bool):
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL lets readers run alongside the writer; NORMAL sync is durable across app crashes in WAL mode
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        if query_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+    return set_pragmas
+
+
+if url.get_backend_name() == "sqlite" and settings.SQLITE_PROFILE == "production":
+    event.listen(engine, "connect", _sqlite_pragmas(query_only=False))
+    event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas(query_only=False))
+    event.listen(async_read_engine.sync_engine, "connect", _sqlite_pragmas(query_only=True))
+
+
+# VM instructions between checks of the statement deadline
+SQLITE_PROGRESS_STEPS = 1000
+# MySQL: "Query execution was interrupted, maximum statement execution time exceeded"
+MYSQL_STATEMENT_TIMEOUT = 3024
+# MySQL: "Duplicate entry ... for key ..."
+MYSQL_DUPLICATE_ENTRY = 1062
+
+
+def _sqlite_interrupt_handler(dbapi_connection, connection_record):
+    info = connection_record.info
+
+    def interrupt():
+        # Runs on the driver's thread; a truthy result aborts the statement
+        armed = info.get("statement_deadline")
+        if armed is None or not (armed[1].cancelled or time.monotonic() > armed[0]):
+            return False
+        # Disarm so the rollback that follows is not interrupted too
+        info.pop("statement_deadline", None)
+        return True
+
+    dbapi_connection.await_(dbapi_connection.driver_connection.set_progress_handler(interrupt, SQLITE_PROGRESS_STEPS))
+
+
+def _mysql_statement_timeout(dbapi_connection, connection_record):
+    # MAX_EXECUTION_TIME only applies to SELECTs; writes are bounded by lock waits.
+    # The streamed export overrides it per statement (see export.py)
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"SET SESSION max_execution_time = {settings.DB_STATEMENT_TIMEOUT_MS}")
+    cursor.close()
+
+
+def _arm_statement(conn, cursor, statement, parameters, context, executemany):
+    timeout = settings.DB_STATEMENT_TIMEOUT_MS
+    deadline = time.monotonic() + timeout / 1000 if timeout > 0 else math.inf
+    conn.info["statement_deadline"] = (deadline, current_request())
+
+
+def _disarm_statement(conn, *args):
+    conn.info.pop("statement_deadline", None)
+
+
+def _disarm_on_error(context):
+    # Only a database error means the statement has finished; after a task
+    # cancellation it may still be running and must stay interruptible
+    if context.connection is not None and isinstance(context.original_exception, Exception):
+        _disarm_statement(context.connection)
+
+
+# Request engines only: scripts and migrations on the sync engine run unbounded.
+# SQLite statements are also abandoned when the client disconnects (admission.py)
+if url.get_backend_name() == "sqlite":
+    for _engine in {async_engine, async_read_engine}:
+        event.listen(_engine.sync_engine, "connect", _sqlite_interrupt_handler)
+        event.listen(_engine.sync_engine, "before_cursor_execute", _arm_statement)
+        event.listen(_engine.sync_engine, "after_cursor_execute", _disarm_statement)
+        event.listen(_engine.sync_engine, "handle_error", _disarm_on_error)
+elif url.get_backend_name() == "mysql" and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+    event.listen(async_engine.sync_engine, "connect", _mysql_statement_timeout)
+
+
+def is_statement_timeout(error: exc.OperationalError) -> bool:
+    """Whether a statement was aborted by the timeout (or client disconnect) above"""
+    if url.get_backend_name() == "sqlite":
+        return "interrupted" in str(error.orig)
+    return bool(error.orig.args) and error.orig.args[0] == MYSQL_STATEMENT_TIMEOUT
+
+
+def is_unique_violation(error: exc.IntegrityError) -> bool:
+    """Whether a write was rejected by a unique index rather than another constraint"""
+    if url.get_backend_name() == "sqlite":
+        return "UNIQUE constraint failed" in str(error.orig)
+    return bool(error.orig.args) and error.orig.args[0] == MYSQL_DUPLICATE_ENTRY
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # One statement runs per connection at a time, so a single start suffices
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop("query_start")
+    add_phase_time("db", elapsed)
+    record_query(statement, parameters, elapsed)
+
+
+def _query_failed(context):
+    # after_cursor_execute does not fire for failed statements, timeouts included
+    if context.connection is None:
+        return
+    started = context.connection.info.pop("query_start", None)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        add_phase_time("db", elapsed)
+        record_query(context.statement, context.parameters, elapsed, context.original_exception)
+
+
+# Charge statement time and counts to the request that issued it (see metrics.py, query_stats.py)
+for _engine in {engine, async_engine.sync_engine, async_read_engine.sync_engine}:
+    event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(_engine, "handle_error", _query_failed)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
+async def get_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+async def get_read_db():
+    """Dependency to get an async session for read-only endpoints"""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+async def dispose_engines() -> None:
+    """Close pooled async connections on shutdown"""
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
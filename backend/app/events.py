@@ -0,0 +1,204 @@
+import asyncio
+import secrets
+from collections import OrderedDict, deque
+from typing import AsyncIterator, List, Optional
+import orjson
+from starlette.responses import StreamingResponse
+from config import settings
+from result_cache import result_cache
+
+# Tells browsers how long to wait before reconnecting (milliseconds)
+RETRY_FRAME = b"retry: 3000\n\n"
+HEARTBEAT_FRAME = b": heartbeat\n\n"
+
+
+class ChangeEvent:
+    """One published change, encoded once and shared by every stream"""
+
+    __slots__ = ("seq", "frame")
+
+    def __init__(self, seq: int, frame: bytes):
+        self.seq = seq
+        self.frame = frame
+
+
+class Subscription:
+    """Undelivered events for one open stream"""
+
+    __slots__ = ("user_id", "pending", "wakeup", "reset_at")
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.pending: deque = deque()
+        self.wakeup = asyncio.Event()
+        # Set when events were lost: the client must refetch everything up to this sequence number
+        self.reset_at: Optional[int] = None
+
+    def push(self, event: ChangeEvent) -> None:
+        if len(self.pending) >= settings.EVENTS_QUEUE_SIZE:
+            # Too slow to keep up: drop the backlog and tell the client to refetch
+            self.pending.clear()
+            self.reset_at = event.seq
+        else:
+            self.pending.append(event)
+        self.wakeup.set()
+
+
+class Channel:
+    """A user's recent events and open streams"""
+
+    __slots__ = ("buffer", "subscribers", "dropped")
+
+    def __init__(self, dropped: int):
+        self.buffer: deque = deque(maxlen=settings.EVENTS_BUFFER_SIZE)
+        self.subscribers: set = set()
+        # Highest sequence number this user may have missed; resuming from
+        # before it cannot be replayed
+        self.dropped = dropped
+
+
+class ChangeFeed:
+    """Per-user change events for the SSE stream, held in this process.
+
+    Each user keeps a ring buffer of their last EVENTS_BUFFER_SIZE events for
+    Last-Event-ID resume; at most EVENTS_MAX_USERS buffers are kept, evicting
+    the least recently used user without open streams (users with open
+    streams are never evicted, so the map may exceed the cap). Event ids embed a
+    per-process epoch so ids from before a restart are never misread.
+    """
+
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self.epoch = secrets.token_hex(4)
+        self.published = 0
+        self._seq = 0
+        self._evicted = 0
+        self._channels: "OrderedDict[int, Channel]" = OrderedDict()
+
+    def _channel(self, user_id: int) -> Channel:
+        channel = self._channels.get(user_id)
+        if channel is None:
+            channel = self._channels[user_id] = Channel(self._evicted)
+        self._channels.move_to_end(user_id)
+        self._evict()
+        return channel
+
+    def _evict(self) -> None:
+        # The newest channel is last and never evicted; when every other
+        # channel has open streams the map grows past max_users instead
+        for user_id in list(self._channels)[:-1]:
+            if len(self._channels) <= self.max_users:
+                return
+            if not self._channels[user_id].subscribers:
+                del self._channels[user_id]
+                self._evicted = self._seq
+
+    def publish(self, user_id: int, action: str, version: str, ids: Optional[List[int]] = None, count: Optional[int] = None) -> None:
+        """Record a change to a user's students and wake their streams.
+
+        `ids` is None when a bulk write does not know which rows it touched.
+        """
+        self._seq += 1
+        self.published += 1
+        data = orjson.dumps({
+            "type": action,
+            "ids": ids,
+            "count": len(ids) if count is None and ids is not None else count,
+            "version": version,
+        })
+        event = ChangeEvent(self._seq, b"id: %s\nevent: %s\ndata: %s\n\n" % (
+            self.event_id(self._seq).encode(), action.encode(), data
+        ))
+        channel = self._channel(user_id)
+        if len(channel.buffer) == channel.buffer.maxlen:
+            channel.dropped = channel.buffer[0].seq
+        channel.buffer.append(event)
+        for subscription in channel.subscribers:
+            subscription.push(event)
+
+    def connections(self, user_id: int) -> int:
+        channel = self._channels.get(user_id)
+        return len(channel.subscribers) if channel is not None else 0
+
+    def subscribe(self, user_id: int, last_event_id: Optional[str]) -> Subscription:
+        """Open a stream, queueing the events missed since `last_event_id`.
+
+        When those are no longer buffered the subscription starts with a reset.
+        """
+        channel = self._channel(user_id)
+        subscription = Subscription(user_id)
+        channel.subscribers.add(subscription)
+        if last_event_id:
+            epoch, _, seq = last_event_id.partition("-")
+            if epoch != self.epoch or not seq.isdigit() or int(seq) < channel.dropped:
+                subscription.reset_at = self._seq
+            else:
+                subscription.pending.extend(event for event in channel.buffer if event.seq > int(seq))
+        return subscription
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        channel = self._channels.get(subscription.user_id)
+        if channel is not None:
+            channel.subscribers.discard(subscription)
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._channels),
+            "max_users": self.max_users,
+            "connections": sum(len(channel.subscribers) for channel in self._channels.values()),
+            "published": self.published,
+        }
+
+
+change_feed = ChangeFeed(settings.EVENTS_MAX_USERS)
+
+
+def reset_frame(seq: int, version: str) -> bytes:
+    """Tells the client that events were missed and it should refetch everything"""
+    data = orjson.dumps({"type": "reset", "ids": None, "count": None, "version": version})
+    return b"id: %s\nevent: reset\ndata: %s\n\n" % (change_feed.event_id(seq).encode(), data)
+
+
+async def publish_change(user_id: int, action: str, ids: Optional[List[int]] = None, count: Optional[int] = None) -> None:
+    """Invalidate a user's cached responses and notify their open streams; call after committing"""
+    generation = await result_cache.bump(user_id)
+    change_feed.publish(user_id, action, result_cache.format_version(generation), ids, count)
+
+
+async def event_stream(subscription: Subscription) -> AsyncIterator[bytes]:
+    """SSE frames for one subscription: resets and events as they arrive, heartbeats in between"""
+    yield RETRY_FRAME
+    while True:
+        if subscription.reset_at is not None:
+            seq, subscription.reset_at = subscription.reset_at, None
+            yield reset_frame(seq, (await result_cache.version(subscription.user_id))[0])
+        while subscription.pending:
+            yield subscription.pending.popleft().frame
+        if subscription.reset_at is not None:
+            continue
+        subscription.wakeup.clear()
+        try:
+            await asyncio.wait_for(subscription.wakeup.wait(), settings.EVENTS_HEARTBEAT_SECONDS)
+        except asyncio.TimeoutError:
+            yield HEARTBEAT_FRAME
+
+
+class EventStreamResponse(StreamingResponse):
+    """text/event-stream response that closes its subscription however the stream ends"""
+
+    def __init__(self, subscription: Subscription):
+        super().__init__(
+            event_stream(subscription),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        self.subscription = subscription
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            change_feed.unsubscribe(self.subscription)
@@ -0,0 +1,93 @@
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from fastapi.responses import StreamingResponse
+import orjson
+from sqlalchemy import select
+from config import settings
+from database import AsyncReadSessionLocal
+from models import Student
+from serialization import STUDENT_COLUMNS, STUDENT_FIELDS, student_dict
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def negotiate_format(requested: Optional[str], accept: Optional[str]) -> Optional[str]:
+    """Pick the export format from ?format= first, then the Accept header.
+
+    Returns None when the requested format is not supported.
+    """
+    if requested:
+        requested = requested.lower()
+        return requested if requested in MEDIA_TYPES else None
+    if accept:
+        for fmt in ("ndjson", "csv"):
+            if MEDIA_TYPES[fmt] in accept:
+                return fmt
+    return "json"
+
+
+def _encode_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def _rows(user_id: int) -> AsyncIterator[list]:
+    """Yield the user's students in batches straight from a server-side cursor"""
+    statement = (
+        select(*STUDENT_COLUMNS)
+        .where(Student.created_by == user_id)
+        .order_by(Student.created_at.desc(), Student.id.desc())
+        .execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+        # A streamed SELECT runs until the last row is fetched, so the session-wide
+        # max_execution_time (DB_STATEMENT_TIMEOUT_MS) would truncate large exports
+        .prefix_with("/*+ MAX_EXECUTION_TIME(0) */", dialect="mysql")
+    )
+    # The request session is closed once the handler returns, so the stream owns its own
+    async with AsyncReadSessionLocal() as db:
+        result = await db.stream(statement)
+        async for partition in result.partitions():
+            yield partition
+
+
+async def _ndjson_chunks(user_id: int) -> AsyncIterator[bytes]:
+    async for partition in _rows(user_id):
+        yield b"".join(orjson.dumps(student_dict(row)) + b"\n" for row in partition)
+
+
+async def _csv_chunks(user_id: int) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(STUDENT_FIELDS)
+    async for partition in _rows(user_id):
+        writer.writerows([_encode_value(value) for value in row] for row in partition)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_students(user_id: int, fmt: str, accept_encoding: Optional[str] = None) -> StreamingResponse:
+    """Stream all of a user's students as NDJSON or CSV with flat memory use"""
+    chunks = _ndjson_chunks(user_id) if fmt == "ndjson" else _csv_chunks(user_id)
+    headers = {"Content-Disposition": f'attachment; filename="students.{fmt}"'}
+    if accept_encoding and "gzip" in accept_encoding:
+        chunks = _gzip(chunks)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[fmt], headers=headers)
@@ -0,0 +1,130 @@
+from collections import Counter
+from typing import Iterable, Optional
+from sqlalchemy import delete, func, insert, literal, select, text, update, union_all
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import Student, StudentFacet
+
+# Student columns summarised in student_facets
+FACETS = ("course", "city")
+
+
+def facet_deltas(rows: Iterable, sign: int = 1, facets: Iterable[str] = FACETS) -> Counter:
+    """Count (facet, value) pairs for rows with course/city attributes or keys"""
+    deltas = Counter()
+    for row in rows:
+        for facet in facets:
+            value = row[facet] if isinstance(row, dict) else getattr(row, facet)
+            deltas[(facet, value)] += sign
+    return deltas
+
+
+async def lock_for_write(db) -> None:
+    """Take SQLite's write lock before reading the rows a write will change.
+
+    pysqlite only opens a transaction at the first INSERT/UPDATE/DELETE, so old
+    values read before it are unlocked and two concurrent writers would apply
+    the same facet delta. MySQL locks the rows it reads with FOR UPDATE instead.
+    """
+    if db.bind.dialect.name != "sqlite":
+        return
+    raw = await (await db.connection()).get_raw_connection()
+    if not raw.driver_connection.in_transaction:
+        await db.execute(text("BEGIN IMMEDIATE"))
+
+
+async def grouped_deltas(db, where, sign: int = -1, facets: Iterable[str] = FACETS) -> Counter:
+    """Facet deltas for every student matching `where`, computed with GROUP BY"""
+    deltas = Counter()
+    if facets:
+        await lock_for_write(db)
+    for facet in facets:
+        column = getattr(Student, facet)
+        statement = select(column, func.count()).where(where).group_by(column)
+        if db.bind.dialect.name == "mysql":
+            # Lock the matched rows so the counts cannot drift before the write
+            statement = statement.with_for_update()
+        result = await db.execute(statement)
+        for value, count in result.all():
+            deltas[(facet, value)] += sign * count
+    return deltas
+
+
+async def adjust_facets(db, user_id: int, deltas: Counter) -> None:
+    """Apply count deltas to the user's facet summary in the current transaction"""
+    rows = [
+        {"user_id": user_id, "facet": facet, "value": value, "count": delta}
+        for (facet, value), delta in deltas.items() if delta
+    ]
+    if not rows:
+        return
+
+    dialect = db.bind.dialect.name
+    if dialect == "sqlite":
+        statement = sqlite_insert(StudentFacet)
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[StudentFacet.user_id, StudentFacet.facet, StudentFacet.value],
+                set_={"count": StudentFacet.count + statement.excluded["count"]}
+            ),
+            rows
+        )
+    elif dialect == "mysql":
+        statement = mysql_insert(StudentFacet)
+        await db.execute(
+            statement.on_duplicate_key_update(count=StudentFacet.count + statement.inserted["count"]),
+            rows
+        )
+    else:
+        for row in rows:
+            result = await db.execute(
+                update(StudentFacet)
+                .where(
+                    StudentFacet.user_id == user_id,
+                    StudentFacet.facet == row["facet"],
+                    StudentFacet.value == row["value"]
+                )
+                .values(count=StudentFacet.count + row["count"])
+            )
+            if result.rowcount == 0:
+                await db.execute(insert(StudentFacet).values(**row))
+
+    if any(row["count"] < 0 for row in rows):
+        await db.execute(
+            delete(StudentFacet).where(StudentFacet.user_id == user_id, StudentFacet.count <= 0)
+        )
+
+
+def rebuild_facets(conn, user_id: Optional[int] = None) -> int:
+    """Recompute student_facets from the students table (sync connection).
+
+    Rebuilds one user's summary, or every user's when user_id is None.
+    Returns the number of facet rows written.
+    """
+    scope = [] if user_id is None else [StudentFacet.user_id == user_id]
+    conn.execute(delete(StudentFacet).where(*scope))
+
+    selects = []
+    for facet in FACETS:
+        column = getattr(Student, facet)
+        grouped = select(Student.created_by, literal(facet), column, func.count()).group_by(Student.created_by, column)
+        if user_id is not None:
+            grouped = grouped.where(Student.created_by == user_id)
+        selects.append(grouped)
+
+    result = conn.execute(
+        insert(StudentFacet).from_select(
+            ["user_id", "facet", "value", "count"],
+            union_all(*selects)
+        )
+    )
+    return result.rowcount
+
+
+def ensure_facets(engine) -> None:
+    """Backfill student_facets once for databases created before it existed"""
+    with engine.begin() as conn:
+        has_facets = conn.execute(select(StudentFacet.user_id).limit(1)).first()
+        has_students = conn.execute(select(Student.id).limit(1)).first()
+        if has_students and not has_facets:
+            rebuild_facets(conn)
@@ -0,0 +1,84 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Optional
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from config import settings
+
+# Password hashing context
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# Worker pool for bcrypt; created on first use so imports (and spawned workers) stay cheap
+_executor: Optional[Executor] = None
+_in_flight = 0
+
+
+def _truncate(password: str) -> str:
+    # Truncate password if too long for bcrypt (72 bytes limit)
+    if len(password.encode('utf-8')) > 72:
+        password = password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
+    return password
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash"""
+    return pwd_context.verify(_truncate(plain_password), hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    """Hash a password"""
+    return pwd_context.hash(_truncate(password))
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Check whether a stored hash uses outdated settings (e.g. fewer bcrypt rounds)"""
+    return pwd_context.needs_update(hashed_password)
+
+
+def _get_executor() -> Optional[Executor]:
+    global _executor
+    if _executor is None and settings.PASSWORD_HASH_WORKERS > 0:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+async def _run(func, *args):
+    """Run a hashing call off the event loop, rejecting work once the queue is full"""
+    global _in_flight
+    if _in_flight >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, please retry shortly",
+            headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER)},
+        )
+
+    _in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        # With no process workers configured, fall back to the default thread pool
+        return await loop.run_in_executor(_get_executor(), partial(func, *args))
+    finally:
+        _in_flight -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the hashing pool"""
+    return await _run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in the hashing pool"""
+    return await _run(get_password_hash, password)
+
+
+def shutdown_executor() -> None:
+    """Stop the hashing workers"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
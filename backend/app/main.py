@@ -1,12 +1,35 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from database import engine, Base
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from starlette.concurrency import run_in_threadpool
+from admission import AdmissionMiddleware, overloaded
+from database import dispose_engines, engine, is_statement_timeout
 from routers import auth, students
 from routers import admin
 from config import settings
+from search import detect_search_index
+from hashing import shutdown_executor
+from migrations import init_db
+from metrics import MetricsMiddleware, metrics
+from query_stats import QueryStatsMiddleware
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks.
+
+    Nothing touches the database at import time; schema bootstrap runs here
+    only when INIT_DB_ON_STARTUP is set (otherwise run scripts/init_db.py once).
+    """
+    if settings.INIT_DB_ON_STARTUP:
+        await run_in_threadpool(init_db)
+    else:
+        await run_in_threadpool(detect_search_index, engine)
+    yield
+    shutdown_executor()
+    await dispose_engines()
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -15,9 +38,14 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/v1/docs",
     redoc_url="/api/v1/redoc",
-    openapi_url="/api/v1/openapi.json"
+    openapi_url="/api/v1/openapi.json",
+    lifespan=lifespan
 )
 
+# Innermost, so shed requests still get CORS headers and are counted in metrics
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -30,8 +58,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the browser client honour throttling and shedding (429/503)
+    expose_headers=["Retry-After"],
 )
 
+app.add_middleware(QueryStatsMiddleware)
+
+# Added last so it wraps everything else, CORS included
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """No database connection freed up within DB_POOL_TIMEOUT"""
+    return overloaded("Database is busy, please retry shortly")
+
+
+@app.exception_handler(OperationalError)
+async def statement_timeout_handler(request: Request, exc: OperationalError):
+    """Statement aborted after DB_STATEMENT_TIMEOUT_MS; other errors stay 500s"""
+    if not is_statement_timeout(exc):
+        raise exc
+    return overloaded("Query took too long, please retry shortly")
+
+
 # Include routers with API versioning
 app.include_router(admin.router, prefix="/api/v1")
 app.include_router(auth.router, prefix="/api/v1")
@@ -56,3 +106,9 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "service": settings.APP_NAME}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Request metrics in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
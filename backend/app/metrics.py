@@ -0,0 +1,166 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+
+# Upper bounds (seconds) shared by every histogram
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASES = ("auth", "db", "serialize")
+_PHASE_INDEX = {name: index for index, name in enumerate(PHASES)}
+UNMATCHED = "unmatched"
+# Status recorded for requests abandoned by the client (see admission.py)
+CLIENT_CLOSED = 499
+
+# Seconds spent in each phase by the current request, in PHASES order
+_phase_times: ContextVar[Optional[list]] = ContextVar("phase_times", default=None)
+
+
+class Histogram:
+    """Fixed-bucket histogram; the bucket array is allocated once up front"""
+
+    __slots__ = ("counts", "sum")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+
+
+class Metrics:
+    """Per-route request metrics.
+
+    Only ever updated from the event loop thread, so plain dicts and ints are
+    enough: no locks on the request path. Series are created the first time a
+    route is seen and reused afterwards.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.durations: dict[tuple, Histogram] = {}
+        self.phases: dict[tuple, Histogram] = {}
+        self.statuses: dict[tuple, int] = {}
+
+    def record(self, method: str, route: str, status: int, seconds: float, phase_times: list) -> None:
+        key = (method, route)
+        histogram = self.durations.get(key)
+        if histogram is None:
+            histogram = self.durations[key] = Histogram()
+            for phase in PHASES:
+                self.phases[(method, route, phase)] = Histogram()
+        histogram.observe(seconds)
+        for phase, spent in zip(PHASES, phase_times):
+            if spent:
+                self.phases[(method, route, phase)].observe(spent)
+        status_key = (method, route, status)
+        self.statuses[status_key] = self.statuses.get(status_key, 0) + 1
+
+    def render(self) -> str:
+        """Render every series in the Prometheus text exposition format"""
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_requests_total Responses sent, by route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.statuses.items()):
+            lines.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Time from request start to the end of the response body.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.durations.items()):
+            _render_histogram(lines, "http_request_duration_seconds", f'method="{method}",route="{_escape(route)}"', histogram)
+
+        lines += [
+            "# HELP http_request_phase_seconds Time spent per request in auth, database and serialization.",
+            "# TYPE http_request_phase_seconds histogram",
+        ]
+        for (method, route, phase), histogram in sorted(self.phases.items()):
+            labels = f'method="{method}",route="{_escape(route)}",phase="{phase}"'
+            _render_histogram(lines, "http_request_phase_seconds", labels, histogram)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histogram(lines: list, name: str, labels: str, histogram: Histogram) -> None:
+    cumulative = 0
+    for bound, count in zip(BUCKETS, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    cumulative += histogram.counts[-1]
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+    lines.append(f"{name}_count{{{labels}}} {cumulative}")
+
+
+metrics = Metrics()
+
+
+def add_phase_time(phase: str, seconds: float) -> None:
+    """Charge time to a phase of the current request, if one is being measured"""
+    times = _phase_times.get()
+    if times is not None:
+        times[_PHASE_INDEX[phase]] += seconds
+
+
+class phase:
+    """Context manager timing a block as part of a request phase"""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        add_phase_time(self.name, time.perf_counter() - self.start)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing each HTTP request under its route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+        times = [0.0] * len(PHASES)
+        token = _phase_times.set(times)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            _phase_times.reset(token)
+            # The router records the matched route in the scope; label by its
+            # template so /students/1 and /students/2 share one series
+            route = scope.get("route")
+            metrics.record(
+                scope["method"],
+                route.path if route is not None else UNMATCHED,
+                CLIENT_CLOSED if scope.get("client_disconnected") else status,
+                time.perf_counter() - start,
+                times,
+            )
@@ -0,0 +1,39 @@
+from sqlalchemy import inspect
+from database import Base, engine, ensure_database
+
+
+def ensure_indexes(engine) -> list[str]:
+    """Create indexes declared on the models that existing tables are missing.
+
+    `Base.metadata.create_all` only creates missing tables, so indexes added
+    to a model later never reach databases that already have the table.
+    Returns the names of the indexes that were created.
+    """
+    inspector = inspect(engine)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+    return created
+
+
+def init_db() -> None:
+    """Create the database, tables, indexes, search index and facet summary.
+
+    Idempotent; run once per deploy with `python scripts/init_db.py`, or on
+    startup when INIT_DB_ON_STARTUP is set.
+    """
+    # Imported here: they pull in the models, which register on Base.metadata
+    from facets import ensure_facets
+    from search import ensure_search_index
+
+    ensure_database()
+    Base.metadata.create_all(bind=engine)
+    ensure_indexes(engine)
+    ensure_search_index(engine)
+    ensure_facets(engine)
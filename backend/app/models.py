@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -33,3 +33,23 @@ class Student(Base):
 
     # Relationship to user who created this student
     created_by_user = relationship("User", back_populates="students")
+
+    # Every list query is scoped to one owner and ordered by a sort field with id as
+    # tie-breaker, so each sortable column gets an (owner, column, id) index
+    __table_args__ = tuple(
+        Index(f"ix_students_owner_{column}", "created_by", column, "id")
+        for column in ("name", "email", "age", "course", "city", "created_at", "updated_at")
+    ) + (
+        # Walks one owner's rows in id order (per-user purge chunks)
+        Index("ix_students_owner_id", "created_by", "id"),
+    )
+
+
+class StudentFacet(Base):
+    __tablename__ = "student_facets"
+
+    # Per-user count of students for each distinct course/city value
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    facet = Column(String(20), primary_key=True)
+    value = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
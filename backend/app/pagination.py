@@ -0,0 +1,72 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import DateTime, and_, or_
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the query"""
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, row_id: int, direction: str = "next") -> str:
+    """Encode the last seen (sort value, id) position into an opaque cursor"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort_by, sort_order, direction, value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str, column) -> dict:
+    """Decode a cursor and check it was issued for the same sort field and order"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort_by, cursor_order, direction, value, row_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode("ascii"))
+        )
+        if isinstance(column.type, DateTime) and value is not None:
+            value = datetime.fromisoformat(value)
+        row_id = int(row_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursor("Malformed cursor")
+
+    if cursor_sort_by != sort_by or cursor_order != sort_order:
+        raise InvalidCursor("Cursor does not match the requested sort")
+    if direction not in ("next", "prev"):
+        raise InvalidCursor("Malformed cursor")
+
+    return {"direction": direction, "value": value, "id": row_id}
+
+
+def keyset_filter(column, id_column, value: Any, row_id: int, descending: bool):
+    """Build the WHERE clause selecting rows strictly after (value, id) in the given order.
+
+    The redundant inclusive bound on the sort column lets the planner seek the
+    (owner, column, id) index to the cursor instead of walking from the start.
+    """
+    if descending:
+        return and_(column <= value, or_(column < value, and_(column == value, id_column < row_id)))
+    return and_(column >= value, or_(column > value, and_(column == value, id_column > row_id)))
+
+
+def order_clauses(column, id_column, descending: bool):
+    """ORDER BY the sort column with id as a stable tie-breaker"""
+    if descending:
+        return column.desc(), id_column.desc()
+    return column.asc(), id_column.asc()
+
+
+def page_cursors(rows: list, sort_by: str, sort_order: str, has_before: bool, has_after: bool) -> tuple[Optional[str], Optional[str]]:
+    """Return (next_cursor, prev_cursor) for a page of rows in display order"""
+    if not rows:
+        return None, None
+    first, last = rows[0], rows[-1]
+    next_cursor = (
+        encode_cursor(sort_by, sort_order, getattr(last, sort_by), last.id, "next")
+        if has_after else None
+    )
+    prev_cursor = (
+        encode_cursor(sort_by, sort_order, getattr(first, sort_by), first.id, "prev")
+        if has_before else None
+    )
+    return next_cursor, prev_cursor
@@ -0,0 +1,99 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import event
+from config import settings
+from models import User
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Lightweight, session-independent copy of the authenticated user"""
+    id: int
+    email: str
+    name: str
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(id=user.id, email=user.email, name=user.name, created_at=user.created_at)
+
+
+class PrincipalCache:
+    """Bounded LRU of verified tokens -> user snapshots.
+
+    Entries expire at the token's `exp` or after `ttl` seconds, whichever is
+    first, and are dropped as soon as the user row changes in this process.
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple[float, UserSnapshot]]" = OrderedDict()
+        self._tokens_by_user: dict[int, set[str]] = {}
+
+    def get(self, token: str) -> Optional[UserSnapshot]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, principal = entry
+        if expires_at <= time.time():
+            self._discard(token)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return principal
+
+    def put(self, token: str, principal: UserSnapshot, token_exp: Optional[int] = None) -> None:
+        if self.max_size <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        self._discard(token)
+        self._entries[token] = (expires_at, principal)
+        self._tokens_by_user.setdefault(principal.id, set()).add(token)
+        while len(self._entries) > self.max_size:
+            self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        for token in self._tokens_by_user.pop(user_id, ()):
+            self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tokens_by_user.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _discard(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is not None:
+            tokens = self._tokens_by_user.get(entry[1].id)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens_by_user[entry[1].id]
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target):
+    principal_cache.invalidate_user(target.id)
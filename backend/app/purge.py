@@ -0,0 +1,180 @@
+import asyncio
+import secrets
+import time
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+from sqlalchemy import delete, exists, func, select, text
+from config import settings
+from database import AsyncSessionLocal
+from events import publish_change
+from facets import FACETS, adjust_facets, lock_for_write
+from models import Student, User
+from principals import principal_cache
+from result_cache import result_cache
+
+
+@dataclass
+class PurgeJob:
+    """Progress of one purge; `user_id` None means every user's data"""
+
+    id: str
+    user_id: Optional[int]
+    status: str = "pending"  # pending | running | done | failed
+    students_total: int = 0
+    students_deleted: int = 0
+    users_deleted: int = 0
+    chunks: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def to_dict(self) -> dict:
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            "id": self.id,
+            "scope": "all" if self.user_id is None else f"user:{self.user_id}",
+            "status": self.status,
+            "students_total": self.students_total,
+            "students_deleted": self.students_deleted,
+            "users_deleted": self.users_deleted,
+            "chunks": self.chunks,
+            "progress": self.students_deleted / self.students_total if self.students_total else 1.0,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.students_deleted / elapsed, 1) if elapsed else 0.0,
+            "error": self.error,
+        }
+
+
+# Recent jobs, oldest first; bounded by PURGE_JOB_HISTORY
+purge_jobs: "OrderedDict[str, PurgeJob]" = OrderedDict()
+
+
+def running_job() -> Optional[PurgeJob]:
+    return next((job for job in purge_jobs.values() if job.status in ("pending", "running")), None)
+
+
+def start_purge(user_id: Optional[int] = None) -> PurgeJob:
+    """Schedule a purge on the running event loop and return its job"""
+    job = PurgeJob(id=secrets.token_hex(8), user_id=user_id)
+    purge_jobs[job.id] = job
+    while len(purge_jobs) > settings.PURGE_JOB_HISTORY:
+        purge_jobs.popitem(last=False)
+    job.task = asyncio.get_running_loop().create_task(run_purge(job))
+    return job
+
+
+async def _chunk_deltas(db, where) -> dict:
+    """Facet deltas per owner for the students matching `where`"""
+    deltas = defaultdict(Counter)
+    await lock_for_write(db)
+    for facet in FACETS:
+        column = getattr(Student, facet)
+        statement = select(Student.created_by, column, func.count()).where(where).group_by(Student.created_by, column)
+        if db.bind.dialect.name == "mysql":
+            statement = statement.with_for_update()
+        result = await db.execute(statement)
+        for user_id, value, count in result.all():
+            deltas[user_id][(facet, value)] -= count
+    return deltas
+
+
+async def _invalidate(deltas: dict) -> None:
+    """Bump each affected owner's cache generation and notify their streams"""
+    for user_id, user_deltas in deltas.items():
+        # Rows deleted for this owner, from their course counts
+        count = -sum(delta for (facet, _), delta in user_deltas.items() if facet == "course")
+        await publish_change(user_id, "deleted", count=count)
+
+
+async def run_purge(job: PurgeJob) -> PurgeJob:
+    """Delete students (and, for a full purge, users) in short id-range transactions.
+
+    Each chunk seeks to the next PURGE_CHUNK_SIZE ids in scope and deletes them,
+    keeping the facet counts in step, so the write lock is only ever held briefly
+    and live requests keep being served between chunks. A per-user purge only
+    visits that user's rows. Rows created after the purge started survive it.
+    """
+    job.status = "running"
+    job.started_at = time.time()
+    owner = [] if job.user_id is None else [Student.created_by == job.user_id]
+    chunk_size = settings.PURGE_CHUNK_SIZE
+
+    try:
+        async with AsyncSessionLocal() as db:
+            low, high, total = (await db.execute(
+                select(func.min(Student.id), func.max(Student.id), func.count(Student.id)).where(*owner)
+            )).one()
+        job.students_total = total
+
+        start = low
+        while start is not None:
+            # Last id of the next chunk; other owners' ids in between are never visited
+            chunk = (
+                select(Student.id).where(Student.id.between(start, high), *owner)
+                .order_by(Student.id).limit(chunk_size).subquery()
+            )
+            async with AsyncSessionLocal() as db:
+                end = (await db.execute(select(func.max(chunk.c.id)))).scalar()
+                if end is None:
+                    break
+                where = Student.id.between(start, end)
+                if owner:
+                    where = where & owner[0]
+                deltas = await _chunk_deltas(db, where)
+                result = await db.execute(delete(Student).where(where).execution_options(synchronize_session=False))
+                for user_id, user_deltas in deltas.items():
+                    await adjust_facets(db, user_id, user_deltas)
+                await db.commit()
+            job.students_deleted += result.rowcount
+            job.chunks += 1
+            await _invalidate(deltas)
+            start = end + 1
+            # Let queued requests take the write lock before the next chunk
+            await asyncio.sleep(settings.PURGE_CHUNK_PAUSE)
+
+        if job.user_id is None:
+            await _purge_users(job)
+
+        job.status = "done"
+    except Exception as e:
+        job.status = "failed"
+        job.error = str(e)
+    finally:
+        job.finished_at = time.time()
+    return job
+
+
+async def _purge_users(job: PurgeJob) -> None:
+    """Delete users that no longer own students, in id-range chunks"""
+    async with AsyncSessionLocal() as db:
+        low, high = (await db.execute(select(func.min(User.id), func.max(User.id)))).one()
+
+    start = low
+    while start is not None and start <= high:
+        end = min(start + settings.PURGE_CHUNK_SIZE - 1, high)
+        async with AsyncSessionLocal() as db:
+            # Users who signed up and added students mid-purge are kept
+            result = await db.execute(
+                delete(User)
+                .where(User.id.between(start, end), ~exists().where(Student.created_by == User.id))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        job.users_deleted += result.rowcount
+        job.chunks += 1
+        start = end + 1
+        await asyncio.sleep(settings.PURGE_CHUNK_PAUSE)
+
+    principal_cache.clear()
+    # Every owner's generation was bumped per chunk; this only frees memory
+    await result_cache.drop_entries()
+    async with AsyncSessionLocal() as db:
+        if db.bind.dialect.name == "sqlite":
+            try:
+                await db.execute(text("DELETE FROM sqlite_sequence WHERE name IN ('students','users')"))
+                await db.commit()
+            except Exception:
+                pass
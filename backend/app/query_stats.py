@@ -0,0 +1,124 @@
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Expanded IN lists render one placeholder per value; fold them so the shape
+# does not depend on how many ids were passed
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+_observers: List[Callable[["QueryStats"], None]] = []
+
+
+def statement_shape(statement: str) -> str:
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """Statements run on behalf of one request"""
+
+    __slots__ = ("scope", "count", "seconds", "shapes")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    @property
+    def label(self) -> str:
+        if self.scope is None:
+            return "-"
+        # Set by the router once the request has been matched
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {route.path if route is not None else self.scope['path']}"
+
+    def repeated(self, threshold: int) -> List[tuple]:
+        """Statement shapes executed more than `threshold` times, most frequent first"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+def record_query(statement: str, parameters, seconds: float, error: Optional[BaseException] = None) -> None:
+    """Account a finished or failed statement to the current request and log it if slow"""
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += seconds
+        stats.shapes[statement_shape(statement)] += 1
+    if seconds * 1000 >= settings.SLOW_QUERY_MS:
+        if isinstance(parameters, list) and len(parameters) > 1:
+            # executemany: the first parameter set is enough to reproduce the statement
+            parameters = f"{parameters[0]!r} (+{len(parameters) - 1} more)"
+        logger.warning(
+            "Slow query (%.1f ms%s) from %s: %s params=%s",
+            seconds * 1000, f", failed: {type(error).__name__}: {error}" if error is not None else "",
+            stats.label if stats is not None else "-", statement_shape(statement), parameters
+        )
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware counting the statements each request runs.
+
+    Warns about statement shapes repeated more than N_PLUS_ONE_THRESHOLD times
+    in one request, and in DEBUG mode reports the count and total database time
+    as X-Query-Count / X-Query-Time-Ms response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = _current.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-query-count", str(stats.count).encode("latin-1")),
+                    (b"x-query-time-ms", f"{stats.seconds * 1000:.2f}".encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            for shape, count in stats.repeated(settings.N_PLUS_ONE_THRESHOLD):
+                logger.warning("Possible N+1 in %s: %d executions of %s", stats.label, count, shape)
+            for observer in _observers:
+                observer(stats)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[List[QueryStats]]:
+    """Fail if any request handled inside the block runs more than `max_queries` statements.
+
+    For tests and scripts driving the app in-process::
+
+        with query_budget(3):
+            client.get("/api/v1/students")
+    """
+    seen: List[QueryStats] = []
+    _observers.append(seen.append)
+    try:
+        yield seen
+    finally:
+        _observers.remove(seen.append)
+    for stats in seen:
+        if stats.count > max_queries:
+            statements = "\n".join(f"  {count}x {shape}" for shape, count in stats.shapes.most_common())
+            raise AssertionError(
+                f"{stats.label} ran {stats.count} queries, budget is {max_queries}:\n{statements}"
+            )
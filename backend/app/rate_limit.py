@@ -0,0 +1,98 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Optional
+from fastapi import HTTPException, Request, status
+from config import settings
+
+
+class TokenBucketLimiter:
+    """In-process token buckets keyed by an arbitrary string.
+
+    Each key may spend `burst` requests at once and regains `per_minute`
+    tokens a minute. A bucket that has refilled completely carries no state,
+    so it is dropped; at most `max_keys` buckets are kept, evicting the least
+    recently used (which resets that key's allowance).
+    """
+
+    def __init__(self, burst: int, per_minute: float, max_keys: int):
+        self.burst = burst
+        self.rate = per_minute / 60.0
+        self.max_keys = max_keys
+        self.rejected = 0
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+
+    def _tokens(self, key: str, now: float) -> float:
+        entry = self._buckets.get(key)
+        if entry is None:
+            return float(self.burst)
+        tokens, updated_at = entry
+        return min(float(self.burst), tokens + (now - updated_at) * self.rate)
+
+    def retry_after(self, key: str, now: Optional[float] = None) -> int:
+        """Seconds until `key` has a token again (0 when it has one now)"""
+        tokens = self._tokens(key, time.monotonic() if now is None else now)
+        if tokens >= 1:
+            return 0
+        return math.ceil((1 - tokens) / self.rate) if self.rate > 0 else 60
+
+    def spend(self, key: str, now: Optional[float] = None) -> None:
+        """Take one token from `key`'s bucket; check `retry_after` first"""
+        now = time.monotonic() if now is None else now
+        self._buckets[key] = (self._tokens(key, now) - 1, now)
+        self._buckets.move_to_end(key)
+        self._expire(now)
+
+    def _expire(self, now: float) -> None:
+        # Least recently touched first: stop at the first bucket still refilling
+        while self._buckets:
+            key, (tokens, updated_at) = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.max_keys and tokens + (now - updated_at) * self.rate < self.burst:
+                break
+            del self._buckets[key]
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._buckets), "max_keys": self.max_keys, "rejected": self.rejected}
+
+
+ip_limiter = TokenBucketLimiter(settings.AUTH_RATE_IP_BURST, settings.AUTH_RATE_IP_PER_MINUTE, settings.AUTH_RATE_MAX_KEYS)
+email_limiter = TokenBucketLimiter(settings.AUTH_RATE_EMAIL_BURST, settings.AUTH_RATE_EMAIL_PER_MINUTE, settings.AUTH_RATE_MAX_KEYS)
+
+
+def client_ip(request: Request) -> str:
+    if settings.AUTH_RATE_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client is not None else "-"
+
+
+def check_auth_rate(request: Request, email: str) -> None:
+    """Reject an auth attempt with 429 once its client IP or its email is out of tokens.
+
+    Called before any database or bcrypt work so a credential-stuffing burst
+    costs a dictionary lookup per request instead of a hashing slot. Both
+    buckets are checked before either is spent, so a rejected attempt costs
+    nothing. Total bcrypt work is bounded by the hashing queue and admission
+    control, not here: a worker-wide bucket would let a distributed flood lock
+    every user out.
+    """
+    if not settings.AUTH_RATE_LIMIT_ENABLED:
+        return
+    now = time.monotonic()
+    buckets = ((ip_limiter, client_ip(request)), (email_limiter, email.lower()))
+    waits = [(limiter, limiter.retry_after(key, now)) for limiter, key in buckets]
+    exhausted = [(limiter, wait) for limiter, wait in waits if wait > 0]
+    if exhausted:
+        for limiter, _ in exhausted:
+            limiter.rejected += 1
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many authentication attempts, please retry later",
+            headers={"Retry-After": str(max(wait for _, wait in exhausted))},
+        )
+    for limiter, key in buckets:
+        limiter.spend(key, now)
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import secrets
+import time
+from collections import OrderedDict
+from typing import Optional
+from config import settings
+
+
+class MemoryBackend:
+    """In-process LRU bounded by entry count and total payload bytes"""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self._entries: "OrderedDict[str, tuple[float, bytes]]" = OrderedDict()
+        self._counters: dict[str, int] = {}
+        # Counters restart with the process, so versions carry a per-process nonce
+        self._nonce = secrets.token_hex(4)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        self._discard(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self.bytes += len(value)
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def set_counter(self, key: str, value: int) -> None:
+        self._counters[key] = value
+
+    def epoch(self) -> str:
+        # Other workers never see this process's bumps; rolling the epoch every
+        # TTL bounds how long a version can outlive a write made elsewhere
+        return f"{self._nonce}.{int(time.time() // max(self.ttl, 1))}"
+
+    async def drop_entries(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def memory_usage(self) -> Optional[int]:
+        return self.bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= len(entry[1])
+
+
+class SharedBackend:
+    """Shared store reached through a redis.asyncio-compatible client.
+
+    Lets every worker see the same generations and entries. Point it at a
+    dedicated database: `drop_entries()` scans all of its keys.
+    """
+
+    def __init__(self, client, ttl: int):
+        self.client = client
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self.client.set(key, value, ex=self.ttl)
+
+    async def get_counter(self, key: str) -> int:
+        return int(await self.client.get(key) or 0)
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(key)
+
+    async def set_counter(self, key: str, value: int) -> None:
+        await self.client.set(key, value)
+
+    def epoch(self) -> str:
+        return ""
+
+    async def drop_entries(self) -> None:
+        # Entries carry a TTL and counters do not; keep the counters
+        async for key in self.client.scan_iter(count=1000):
+            if not key.startswith((b"gen:", b"mtime:")):
+                await self.client.delete(key)
+
+    def memory_usage(self) -> Optional[int]:
+        return None
+
+
+class ResultCache:
+    """Per-user cache of encoded responses, versioned by a per-user generation.
+
+    Writes bump the user's generation, which changes every key built for that
+    user, so stale entries are never read again and age out of the backend.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    async def version(self, user_id: int) -> tuple[str, Optional[int]]:
+        """Return the user's data version and the time of their last write, if known"""
+        generation = await self.backend.get_counter(f"gen:{user_id}")
+        modified = await self.backend.get_counter(f"mtime:{user_id}")
+        return self.format_version(generation), modified or None
+
+    def format_version(self, generation: int) -> str:
+        return f"{generation}.{self.backend.epoch()}"
+
+    @staticmethod
+    def key(user_id: int, namespace: str, params: tuple, version: str) -> str:
+        digest = hashlib.sha1(json.dumps(params, default=str).encode("utf-8")).hexdigest()
+        return f"{namespace}:{user_id}:{version}:{digest}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self.backend.set(key, value)
+
+    async def bump(self, user_id: int) -> int:
+        """Invalidate everything cached for a user; call after committing a write"""
+        generation = await self.backend.incr(f"gen:{user_id}")
+        await self.backend.set_counter(f"mtime:{user_id}", int(time.time()))
+        return generation
+
+    async def drop_entries(self) -> None:
+        """Free every cached response. Generations are kept: resetting them would
+        let versions and ETags clients already hold match different data"""
+        await self.backend.drop_entries()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        stats = {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "memory_bytes": self.backend.memory_usage(),
+        }
+        if isinstance(self.backend, MemoryBackend):
+            stats["entries"] = len(self.backend)
+        return stats
+
+
+def create_backend():
+    """Build the backend selected by RESULT_CACHE_BACKEND"""
+    if settings.RESULT_CACHE_BACKEND == "redis":
+        try:
+            from redis import asyncio as redis
+        except ImportError:
+            raise RuntimeError("RESULT_CACHE_BACKEND=redis requires the 'redis' package")
+        return SharedBackend(redis.from_url(settings.RESULT_CACHE_URL), settings.RESULT_CACHE_TTL)
+
+    max_entries = settings.RESULT_CACHE_MAX_ENTRIES if settings.RESULT_CACHE_BACKEND == "memory" else 0
+    return MemoryBackend(max_entries, settings.RESULT_CACHE_MAX_BYTES, settings.RESULT_CACHE_TTL)
+
+
+result_cache = ResultCache(create_backend())
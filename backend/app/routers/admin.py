@@ -1,37 +1,88 @@
-from fastapi import APIRouter, HTTPException, Header
-from sqlalchemy import text
-from database import engine
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header, Query, status
 from config import settings
+from principals import principal_cache
+from result_cache import result_cache
+from admission import gates
+from events import change_feed
+from rate_limit import email_limiter, ip_limiter
+from purge import purge_jobs, running_job, start_purge
 
-router = APIRouter(prefix="/admin", tags=["Admin"]) 
+router = APIRouter(prefix="/admin", tags=["Admin"])
 
-@router.post("/clear-db")
-def clear_db(x_admin_secret: str | None = Header(default=None)):
-    """Clear all data from users and students tables.
-    Requires header `X-Admin-Secret` to match SECRET_KEY to prevent accidental use.
-    """
+
+def require_admin(x_admin_secret: Optional[str]) -> None:
     if x_admin_secret != settings.SECRET_KEY:
         raise HTTPException(status_code=401, detail="Unauthorized: invalid admin secret")
 
-    dialect = engine.dialect.name
-    if dialect == "mysql":
-        with engine.begin() as conn:
-            conn.execute(text("SET FOREIGN_KEY_CHECKS=0"))
-            conn.execute(text("TRUNCATE TABLE students"))
-            conn.execute(text("TRUNCATE TABLE users"))
-            conn.execute(text("SET FOREIGN_KEY_CHECKS=1"))
-        return {"status": "ok", "dialect": dialect, "action": "truncate"}
-    elif dialect == "sqlite":
-        with engine.begin() as conn:
-            conn.execute(text("DELETE FROM students"))
-            conn.execute(text("DELETE FROM users"))
-            try:
-                conn.execute(text("DELETE FROM sqlite_sequence WHERE name IN ('students','users')"))
-            except Exception:
-                pass
-        return {"status": "ok", "dialect": dialect, "action": "delete"}
-    else:
-        with engine.begin() as conn:
-            conn.execute(text("DELETE FROM students"))
-            conn.execute(text("DELETE FROM users"))
-        return {"status": "ok", "dialect": dialect, "action": "generic-delete"}
+
+def start_purge_job(user_id: Optional[int]) -> dict:
+    running = running_job()
+    if running is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Purge job {running.id} is still running"
+        )
+    job = start_purge(user_id)
+    return {**job.to_dict(), "status_url": f"/api/v1/admin/purge/{job.id}"}
+
+
+@router.post("/clear-db", status_code=status.HTTP_202_ACCEPTED)
+async def clear_db(x_admin_secret: str | None = Header(default=None)):
+    """Start a background purge of all users and students.
+    Requires header `X-Admin-Secret` to match SECRET_KEY to prevent accidental use.
+
+    Rows are deleted in short id-range transactions so live traffic keeps being
+    served; poll the returned `status_url` for progress.
+    """
+    require_admin(x_admin_secret)
+    return start_purge_job(None)
+
+
+@router.post("/purge", status_code=status.HTTP_202_ACCEPTED)
+async def purge(
+    user_id: Optional[int] = Query(None, description="Only purge this user's students"),
+    x_admin_secret: str | None = Header(default=None)
+):
+    """Start a background purge of one user's students, or of everything.
+    Requires header `X-Admin-Secret` to match SECRET_KEY.
+    """
+    require_admin(x_admin_secret)
+    return start_purge_job(user_id)
+
+
+@router.get("/purge")
+async def list_purge_jobs(x_admin_secret: str | None = Header(default=None)):
+    """List recent purge jobs, newest first.
+    Requires header `X-Admin-Secret` to match SECRET_KEY.
+    """
+    require_admin(x_admin_secret)
+    return [job.to_dict() for job in reversed(purge_jobs.values())]
+
+
+@router.get("/purge/{job_id}")
+async def purge_status(job_id: str, x_admin_secret: str | None = Header(default=None)):
+    """Report a purge job's progress and throughput.
+    Requires header `X-Admin-Secret` to match SECRET_KEY.
+    """
+    require_admin(x_admin_secret)
+    job = purge_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Purge job not found")
+    return job.to_dict()
+
+
+@router.get("/cache-stats")
+def cache_stats(x_admin_secret: str | None = Header(default=None)):
+    """Report in-process cache, rate limit, admission and change feed counters.
+    Requires header `X-Admin-Secret` to match SECRET_KEY.
+    """
+    require_admin(x_admin_secret)
+
+    return {
+        "principals": principal_cache.stats(),
+        "results": result_cache.stats(),
+        "auth_rate_limit": {"ip": ip_limiter.stats(), "email": email_limiter.stats()},
+        "admission": {name: gate.stats() for name, gate in gates.items()},
+        "events": change_feed.stats(),
+    }
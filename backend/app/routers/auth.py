@@ -1,22 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
-from database import get_db
+from database import get_db, get_read_db
 from models import User
+from principals import UserSnapshot
 from schemas import UserCreate, UserResponse, UserLogin, Token
 from auth import (
-    get_password_hash,
+    get_password_hash_async,
     create_access_token,
     authenticate_user,
-    get_current_user
+    get_current_user,
+    rehash_password
 )
+from hashing import needs_rehash
+from rate_limit import check_auth_rate
 from config import settings
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(request: Request, user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Register a new user account.
     
@@ -24,8 +29,11 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     - **name**: User's full name (2-100 characters)
     - **password**: Password (minimum 6 characters)
     """
+    check_auth_rate(request, user_data.email)
+    
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    result = await db.execute(select(User).where(User.email == user_data.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -33,7 +41,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     new_user = User(
         email=user_data.email,
         name=user_data.name,
@@ -41,21 +49,28 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     return new_user
 
 
 @router.post("/login", response_model=Token)
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(
+    request: Request,
+    credentials: UserLogin,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_read_db)
+):
     """
     Authenticate user and return JWT token.
     
     - **email**: Registered email address
     - **password**: User's password
     """
-    user = authenticate_user(db, credentials.email, credentials.password)
+    check_auth_rate(request, credentials.email)
+    
+    user = await authenticate_user(db, credentials.email, credentials.password)
     
     if not user:
         raise HTTPException(
@@ -64,6 +79,10 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade hashes made with older bcrypt settings without delaying the response
+    if needs_rehash(user.hashed_password):
+        background_tasks.add_task(rehash_password, user.id, credentials.password)
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": str(user.id)},  # Convert to string for JWT standard compliance
@@ -74,7 +93,7 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_profile(current_user: User = Depends(get_current_user)):
+async def get_current_user_profile(current_user: UserSnapshot = Depends(get_current_user)):
     """
     Get the current authenticated user's profile.
     
@@ -84,7 +103,7 @@ async def get_current_user_profile(current_user: User = Depends(get_current_user
 
 
 @router.get("/verify")
-async def verify_token(current_user: User = Depends(get_current_user)):
+async def verify_token(current_user: UserSnapshot = Depends(get_current_user)):
     """
     Verify if the current JWT token is valid.
     
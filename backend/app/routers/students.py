@@ -1,27 +1,108 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Request, Response
+from sqlalchemy import String, and_, cast, delete, func, insert, literal, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
-from database import get_db
-from models import User, Student
+from database import get_db, get_read_db, is_unique_violation
+from models import Student, StudentFacet
+from principals import UserSnapshot
 from schemas import (
     StudentCreate,
     StudentUpdate,
     StudentResponse,
     StudentListResponse,
+    BulkRowError,
+    BulkImportResponse,
+    StudentSelection,
+    StudentBulkUpdate,
+    BulkWriteResponse,
+    FacetValue,
+    FacetsResponse,
+    StudentBatchRequest,
+    StudentBatchResponse,
+    StudentSummaryResponse,
     MessageResponse
 )
-from auth import get_current_user
+from auth import get_current_user, get_stream_user
+from search import apply_search
+from export import export_students, negotiate_format
+from bulk import read_bulk_records, validation_messages
+from facets import FACETS, adjust_facets, facet_deltas, grouped_deltas, lock_for_write
+from config import settings
+from result_cache import result_cache
+from events import EventStreamResponse, change_feed, publish_change
+from conditional import cache_headers, etag_matches, make_etag, not_modified, user_data_validators
+from pagination import InvalidCursor, decode_cursor, keyset_filter, order_clauses, page_cursors
+from serialization import STUDENT_COLUMNS, ORJSONResponse, dumps, student_dict
 import math
+from datetime import datetime
+from collections import Counter
+import time
 
 router = APIRouter(prefix="/students", tags=["Students"])
 
+VALID_SORT_FIELDS = ["name", "email", "age", "course", "city", "created_at", "updated_at"]
+
+
+def apply_filters(query, search: Optional[str], course: Optional[str], city: Optional[str], ranked: bool = False):
+    """Apply the search/course/city filters shared by list and bulk endpoints.
+    
+    Returns (query, rank) where rank orders full-text matches when `ranked`, or None.
+    """
+    # Apply search filter (full-text index where available, ILIKE otherwise)
+    rank = None
+    if search:
+        query, rank = apply_search(query, search, ranked)
+    
+    # Apply course filter
+    if course:
+        query = query.where(Student.course.ilike(f"%{course}%"))
+    
+    # Apply city filter
+    if city:
+        query = query.where(Student.city.ilike(f"%{city}%"))
+    
+    return query, rank
+
+
+def selection_clause(selection: StudentSelection, user_id: int):
+    """WHERE clause matching the user's students picked by ids and/or filters"""
+    if not selection.ids and not (selection.search or selection.course or selection.city):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide ids or at least one of search, course or city"
+        )
+    
+    selected = select(Student.id).where(Student.created_by == user_id)
+    if selection.ids:
+        selected = selected.where(Student.id.in_(selection.ids))
+    selected, _ = apply_filters(selected, selection.search, selection.course, selection.city)
+    
+    # Wrapped in a derived table so MySQL accepts a subquery on the table being modified
+    matched = selected.subquery()
+    return and_(Student.created_by == user_id, Student.id.in_(select(matched.c.id)))
+
+
+def student_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Student not found"
+    )
+
+
+def duplicate_email() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="A student with this email already exists"
+    )
+
 
 @router.post("", response_model=StudentResponse, status_code=status.HTTP_201_CREATED)
 async def create_student(
     student_data: StudentCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Create a new student record.
@@ -32,158 +113,605 @@ async def create_student(
     - **course**: Course name (2-100 characters)
     - **city**: City name (2-100 characters)
     """
-    # Check if email already exists
-    existing_student = db.query(Student).filter(Student.email == student_data.email).first()
-    if existing_student:
+    values = student_data.model_dump()
+    values["created_by"] = current_user.id
+    
+    # The unique index on email decides duplicates, so there is no check-then-insert race
+    statement = insert(Student).values(**values)
+    try:
+        if db.bind.dialect.insert_returning:
+            student = student_dict((await db.execute(statement.returning(*STUDENT_COLUMNS))).one())
+        else:
+            # No RETURNING (MySQL): set the defaults here so the row is known without reading it back.
+            # DATETIME keeps whole seconds, so drop the microseconds it would round away
+            now = datetime.utcnow().replace(microsecond=0)
+            values.update(created_at=now, updated_at=now)
+            result = await db.execute(statement.values(created_at=now, updated_at=now))
+            student = {"id": result.inserted_primary_key[0], **values}
+    except IntegrityError as e:
+        await db.rollback()
+        if not is_unique_violation(e):
+            raise
+        raise duplicate_email()
+    
+    await adjust_facets(db, current_user.id, facet_deltas([student]))
+    await db.commit()
+    await publish_change(current_user.id, "created", [student["id"]])
+    
+    return ORJSONResponse(student, status_code=status.HTTP_201_CREATED)
+
+
+@router.post("/bulk", response_model=BulkImportResponse)
+async def bulk_create_students(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """
+    Import many students in one request.
+    
+    Accepts a JSON array, NDJSON (`application/x-ndjson`) or a multipart CSV
+    upload in the `file` field with name, email, age, course and city columns.
+    Valid rows are inserted in batches inside a single transaction; invalid
+    or duplicate rows are skipped and reported by row number (1-based).
+    """
+    started = time.perf_counter()
+    records = await read_bulk_records(request)
+    
+    errors: List[BulkRowError] = []
+    valid = []
+    for row, record in enumerate(records, start=1):
+        try:
+            valid.append((row, StudentCreate.model_validate(record)))
+        except ValidationError as e:
+            email = record.get("email") if isinstance(record, dict) else None
+            errors.append(BulkRowError(row=row, email=email, errors=validation_messages(e)))
+    
+    inserted = 0
+    seen_emails = set()
+    deltas = Counter()
+    try:
+        for start in range(0, len(valid), settings.BULK_BATCH_SIZE):
+            batch = valid[start:start + settings.BULK_BATCH_SIZE]
+            
+            # One IN (...) lookup per batch instead of a SELECT per row
+            result = await db.execute(
+                select(Student.email).where(Student.email.in_({data.email for _, data in batch}))
+            )
+            existing = set(result.scalars().all())
+            
+            rows = []
+            for row, data in batch:
+                if data.email in existing or data.email in seen_emails:
+                    errors.append(BulkRowError(
+                        row=row,
+                        email=data.email,
+                        errors=["A student with this email already exists"]
+                    ))
+                    continue
+                seen_emails.add(data.email)
+                rows.append({**data.model_dump(), "created_by": current_user.id})
+            
+            if rows:
+                await db.execute(insert(Student), rows)
+                inserted += len(rows)
+                deltas += facet_deltas(rows)
+        
+        await adjust_facets(db, current_user.id, deltas)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if not is_unique_violation(e):
+            raise
+        # Another request inserted one of these emails after our lookup
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A student with this email already exists"
         )
     
-    # Create new student
-    new_student = Student(
-        name=student_data.name,
-        email=student_data.email,
-        age=student_data.age,
-        course=student_data.course,
-        city=student_data.city,
-        created_by=current_user.id
+    if inserted:
+        await publish_change(current_user.id, "created", count=inserted)
+    
+    elapsed = time.perf_counter() - started
+    errors.sort(key=lambda error: error.row)
+    return BulkImportResponse(
+        inserted=inserted,
+        failed=len(errors),
+        errors=errors,
+        elapsed_ms=round(elapsed * 1000, 2),
+        rows_per_second=round(inserted / elapsed, 1) if elapsed > 0 else 0.0
+    )
+
+
+@router.patch("/bulk", response_model=BulkWriteResponse)
+async def bulk_update_students(
+    payload: StudentBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """
+    Update many students with a single UPDATE statement.
+    
+    Select students with `ids` and/or the same `search`, `course` and `city`
+    filters as the list endpoint, and give the fields to change in `changes`.
+    """
+    update_data = payload.changes.model_dump(exclude_unset=True, exclude_none=True)
+    if not update_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update"
+        )
+    
+    where = selection_clause(payload, current_user.id)
+    statement = (
+        update(Student)
+        .where(where)
+        .values(**update_data)
+        .execution_options(synchronize_session=False)
     )
+    try:
+        # Move the matched rows' counts from their old facet values to the new ones
+        changed_facets = [facet for facet in FACETS if facet in update_data]
+        deltas = await grouped_deltas(db, where, -1, changed_facets)
+        result = await db.execute(statement)
+        for facet in changed_facets:
+            deltas[(facet, update_data[facet])] += result.rowcount
+        await adjust_facets(db, current_user.id, deltas)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if not is_unique_violation(e):
+            raise
+        # The unique constraint rejects an email that is taken or set on several rows
+        raise duplicate_email()
+    if result.rowcount:
+        await publish_change(current_user.id, "updated", count=result.rowcount)
     
-    db.add(new_student)
-    db.commit()
-    db.refresh(new_student)
+    return BulkWriteResponse(affected=result.rowcount)
+
+
+@router.delete("/bulk", response_model=BulkWriteResponse)
+async def bulk_delete_students(
+    payload: StudentSelection,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """
+    Delete many students with a single DELETE statement.
+    
+    Select students with `ids` and/or the `search`, `course` and `city` filters.
+    """
+    where = selection_clause(payload, current_user.id)
+    deltas = await grouped_deltas(db, where, -1)
+    result = await db.execute(
+        delete(Student)
+        .where(where)
+        .execution_options(synchronize_session=False)
+    )
+    await adjust_facets(db, current_user.id, deltas)
+    await db.commit()
+    if result.rowcount:
+        await publish_change(current_user.id, "deleted", count=result.rowcount)
     
-    return new_student
+    return BulkWriteResponse(affected=result.rowcount)
 
 
 @router.get("", response_model=StudentListResponse)
 async def get_students(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous next_cursor/prev_cursor"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
     search: Optional[str] = Query(None, description="Search in name, email, course, or city"),
     course: Optional[str] = Query(None, description="Filter by course"),
     city: Optional[str] = Query(None, description="Filter by city"),
     sort_by: Optional[str] = Query("created_at", description="Sort field"),
     sort_order: Optional[str] = Query("desc", description="Sort order (asc/desc)"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Get a paginated list of students with optional filtering and search.
     
     - **page**: Page number (default: 1)
+    - **cursor**: Keyset cursor; when given, `page` is ignored and the page starts after the cursor
     - **page_size**: Number of items per page (default: 10, max: 100)
     - **search**: Search term to filter by name, email, course, or city
     - **course**: Filter by exact course name
     - **city**: Filter by exact city name
-    - **sort_by**: Field to sort by (name, email, age, course, city, created_at)
+    - **sort_by**: Field to sort by (name, email, age, course, city, created_at, relevance)
     - **sort_order**: Sort direction (asc or desc)
     """
-    # Base query - only students created by current user
-    query = db.query(Student).filter(Student.created_by == current_user.id)
+    # Normalize the sort so equivalent requests share a cache entry
+    if sort_by != "relevance" and sort_by not in VALID_SORT_FIELDS:
+        sort_by = "created_at"
+    sort_order = "asc" if sort_order.lower() == "asc" else "desc"
     
-    # Apply search filter
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Student.name.ilike(search_term),
-                Student.email.ilike(search_term),
-                Student.course.ilike(search_term),
-                Student.city.ilike(search_term)
-            )
-        )
+    params = (search, course, city, sort_by, sort_order, None if cursor else page, page_size, cursor)
+    version, etag, headers = await user_data_validators(current_user.id, "students", params)
+    if etag_matches(request, etag):
+        return not_modified(headers)
     
-    # Apply course filter
-    if course:
-        query = query.filter(Student.course.ilike(f"%{course}%"))
+    cache_key = result_cache.key(current_user.id, "students", params, version)
+    cached = await result_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers=headers)
     
-    # Apply city filter
-    if city:
-        query = query.filter(Student.city.ilike(f"%{city}%"))
+    payload = await list_students(
+        db, current_user.id, page, cursor, page_size, search, course, city, sort_by, sort_order
+    )
+    content = dumps(payload)
+    await result_cache.set(cache_key, content)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+async def list_students(
+    db: AsyncSession,
+    user_id: int,
+    page: int,
+    cursor: Optional[str],
+    page_size: int,
+    search: Optional[str],
+    course: Optional[str],
+    city: Optional[str],
+    sort_by: str,
+    sort_order: str
+) -> dict:
+    """Run the count and page queries behind GET /students.
+    
+    Selects only the response columns and returns the StudentListResponse
+    payload as plain data, ready to encode without re-validating each row.
+    """
+    # Base query - only students created by current user
+    query = select(*STUDENT_COLUMNS).where(Student.created_by == user_id)
+    
+    query, rank = apply_filters(query, search, course, city, ranked=sort_by == "relevance")
     
     # Get total count
-    total = query.count()
+    total = await db.scalar(query.with_only_columns(func.count(Student.id)))
+    total_pages = math.ceil(total / page_size) if total > 0 else 1
     
     # Apply sorting
-    valid_sort_fields = ["name", "email", "age", "course", "city", "created_at", "updated_at"]
-    if sort_by not in valid_sort_fields:
+    if sort_by == "relevance" and rank is not None:
+        # Best full-text matches first; relevance has no stable keyset, so only page mode applies
+        if cursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination is not available for relevance sort"
+            )
+        result = await db.execute(
+            query.order_by(rank, Student.id).offset((page - 1) * page_size).limit(page_size)
+        )
+        return {
+            "students": [student_dict(row) for row in result.all()],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "next_cursor": None,
+            "prev_cursor": None
+        }
+    
+    if sort_by not in VALID_SORT_FIELDS:
         sort_by = "created_at"
+    descending = sort_order == "desc"
     
     sort_column = getattr(Student, sort_by)
-    if sort_order.lower() == "asc":
-        query = query.order_by(sort_column.asc())
-    else:
-        query = query.order_by(sort_column.desc())
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    students = query.offset(offset).limit(page_size).all()
+    if cursor:
+        # Keyset pagination: seek past the cursor position instead of skipping rows
+        try:
+            position = decode_cursor(cursor, sort_by, sort_order, sort_column)
+        except InvalidCursor as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        # Walking backwards reads the reverse order and flips the page afterwards
+        backwards = position["direction"] == "prev"
+        scan_descending = descending != backwards
+        query = query.where(
+            keyset_filter(sort_column, Student.id, position["value"], position["id"], scan_descending)
+        ).order_by(*order_clauses(sort_column, Student.id, scan_descending))
+        
+        rows = (await db.execute(query.limit(page_size + 1))).all()
+        has_more = len(rows) > page_size
+        students = rows[:page_size]
+        if backwards:
+            students.reverse()
+            has_before, has_after = has_more, True
+        else:
+            has_before, has_after = True, has_more
+    else:
+        # Apply pagination
+        query = query.order_by(*order_clauses(sort_column, Student.id, descending))
+        offset = (page - 1) * page_size
+        rows = (await db.execute(query.offset(offset).limit(page_size + 1))).all()
+        students = rows[:page_size]
+        has_before, has_after = page > 1, len(rows) > page_size
     
-    total_pages = math.ceil(total / page_size) if total > 0 else 1
+    next_cursor, prev_cursor = page_cursors(students, sort_by, sort_order, has_before, has_after)
     
-    return StudentListResponse(
-        students=students,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    return {
+        "students": [student_dict(row) for row in students],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor
+    }
 
 
 @router.get("/all", response_model=List[StudentResponse])
 async def get_all_students(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    export_format: Optional[str] = Query(None, alias="format", description="json, ndjson or csv"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Get all students without pagination.
     
-    Useful for exports or dropdowns.
+    Useful for exports or dropdowns. NDJSON and CSV are streamed in chunks
+    (select with `?format=` or the `Accept` header) and gzip-encoded when
+    the client sends `Accept-Encoding: gzip`.
     """
-    students = db.query(Student).filter(
-        Student.created_by == current_user.id
-    ).order_by(Student.created_at.desc()).all()
+    fmt = negotiate_format(export_format, request.headers.get("accept"))
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported export format"
+        )
+    if fmt != "json":
+        return export_students(current_user.id, fmt, request.headers.get("accept-encoding"))
+    
+    result = await db.execute(
+        select(*STUDENT_COLUMNS).where(
+            Student.created_by == current_user.id
+        ).order_by(Student.created_at.desc())
+    )
     
-    return students
+    return ORJSONResponse([student_dict(row) for row in result.all()])
+
+
+@router.get("/facets", response_model=FacetsResponse)
+async def get_facets(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Get course and city values with their student counts."""
+    _, etag, headers = await user_data_validators(current_user.id, "facets", ())
+    if etag_matches(request, etag):
+        return not_modified(headers)
+    response.headers.update(headers)
+    
+    result = await db.execute(
+        select(StudentFacet.facet, StudentFacet.value, StudentFacet.count).where(
+            StudentFacet.user_id == current_user.id
+        ).order_by(StudentFacet.facet, StudentFacet.value)
+    )
+    facets = {facet: [] for facet in FACETS}
+    for facet, value, count in result.all():
+        facets[facet].append(FacetValue(value=value, count=count))
+    return FacetsResponse(courses=facets["course"], cities=facets["city"])
+
+
+@router.get("/summary", response_model=StudentSummaryResponse)
+async def get_summary(
+    request: Request,
+    top: int = Query(5, ge=1, le=50, description="Courses/cities to include in the top lists"),
+    recent: int = Query(5, ge=0, le=50, description="Most recently created students to include"),
+    age_bucket: int = Query(5, ge=1, le=50, description="Width of the age histogram buckets"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """
+    Get everything the dashboard shows in one request.
+    
+    Totals, distinct and top course/city counts and the age histogram come
+    from one statement over the facet summary and the (owner, age) index;
+    the recent students are a second, index-ordered statement.
+    """
+    params = (top, recent, age_bucket)
+    version, etag, headers = await user_data_validators(current_user.id, "summary", params)
+    if etag_matches(request, etag):
+        return not_modified(headers)
+    
+    cache_key = result_cache.key(current_user.id, "summary", params, version)
+    cached = await result_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers=headers)
+    
+    aggregates = union_all(
+        select(StudentFacet.facet, StudentFacet.value, StudentFacet.count)
+        .where(StudentFacet.user_id == current_user.id),
+        select(literal("age"), cast(Student.age, String), func.count())
+        .where(Student.created_by == current_user.id)
+        .group_by(Student.age)
+    )
+    values = {facet: [] for facet in (*FACETS, "age")}
+    for facet, value, count in (await db.execute(aggregates)).all():
+        values[facet].append((value, count))
+    
+    # Top lists: most students first, then alphabetical
+    ranked = {
+        facet: sorted(values[facet], key=lambda item: (-item[1], item[0]))
+        for facet in FACETS
+    }
+    histogram = Counter()
+    for age, count in values["age"]:
+        histogram[int(age) // age_bucket] += count
+    
+    recent_rows = []
+    if recent:
+        result = await db.execute(
+            select(*STUDENT_COLUMNS)
+            .where(Student.created_by == current_user.id)
+            .order_by(Student.created_at.desc(), Student.id.desc())
+            .limit(recent)
+        )
+        recent_rows = [student_dict(row) for row in result.all()]
+    
+    content = dumps({
+        "total": sum(count for _, count in values["course"]),
+        "course_count": len(values["course"]),
+        "city_count": len(values["city"]),
+        "top_courses": [{"value": value, "count": count} for value, count in ranked["course"][:top]],
+        "top_cities": [{"value": value, "count": count} for value, count in ranked["city"][:top]],
+        "age_histogram": [
+            {"min_age": bucket * age_bucket, "max_age": bucket * age_bucket + age_bucket - 1, "count": histogram[bucket]}
+            for bucket in sorted(histogram)
+        ],
+        "recent": recent_rows,
+    })
+    await result_cache.set(cache_key, content)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+async def facet_values(db: AsyncSession, user_id: int, facet: str) -> List[str]:
+    result = await db.execute(
+        select(StudentFacet.value).where(
+            StudentFacet.user_id == user_id,
+            StudentFacet.facet == facet
+        ).order_by(StudentFacet.value)
+    )
+    return result.scalars().all()
 
 
 @router.get("/courses", response_model=List[str])
 async def get_unique_courses(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Get all unique course names for filtering."""
-    courses = db.query(Student.course).filter(
-        Student.created_by == current_user.id
-    ).distinct().all()
-    return [course[0] for course in courses]
+    _, etag, headers = await user_data_validators(current_user.id, "courses", ())
+    if etag_matches(request, etag):
+        return not_modified(headers)
+    response.headers.update(headers)
+    return await facet_values(db, current_user.id, "course")
 
 
 @router.get("/cities", response_model=List[str])
 async def get_unique_cities(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Get all unique city names for filtering."""
-    cities = db.query(Student.city).filter(
-        Student.created_by == current_user.id
-    ).distinct().all()
-    return [city[0] for city in cities]
+    _, etag, headers = await user_data_validators(current_user.id, "cities", ())
+    if etag_matches(request, etag):
+        return not_modified(headers)
+    response.headers.update(headers)
+    return await facet_values(db, current_user.id, "city")
+
+
+@router.get("/events")
+async def student_events(
+    last_event_id: Optional[str] = Header(None),
+    current_user: UserSnapshot = Depends(get_stream_user)
+):
+    """
+    Stream changes to the current user's students as server-sent events.
+    
+    `created`, `updated` and `deleted` events carry the affected `ids` (null
+    for bulk writes), a `count` and the data `version` after the change (as
+    used in ETags). Reconnect with `Last-Event-ID` to replay missed events; a
+    `reset` event means they are gone and everything should be refetched.
+    A comment frame is sent every EVENTS_HEARTBEAT_SECONDS.
+    """
+    if change_feed.connections(current_user.id) >= settings.EVENTS_MAX_CONNECTIONS_PER_USER:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"At most {settings.EVENTS_MAX_CONNECTIONS_PER_USER} event streams per user",
+            headers={"Retry-After": "30"}
+        )
+    return EventStreamResponse(change_feed.subscribe(current_user.id, last_event_id))
+
+
+async def fetch_batch(db: AsyncSession, user_id: int, ids: List[int]) -> ORJSONResponse:
+    """Resolve ids with one IN query and answer in request order.
+    
+    Ids that do not exist or belong to another user come back as
+    `{"id": ..., "found": false, "student": null}` and are listed in `missing`.
+    """
+    if len(ids) > settings.BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BATCH_MAX_IDS} ids can be fetched per request"
+        )
+    
+    result = await db.execute(
+        select(*STUDENT_COLUMNS).where(
+            Student.id.in_(set(ids)),
+            Student.created_by == user_id
+        )
+    )
+    found = {row.id: student_dict(row) for row in result.all()}
+    
+    results = [{"id": student_id, "found": student_id in found, "student": found.get(student_id)} for student_id in ids]
+    missing = list(dict.fromkeys(student_id for student_id in ids if student_id not in found))
+    return ORJSONResponse({"results": results, "missing": missing})
+
+
+@router.get("/batch", response_model=StudentBatchResponse)
+async def get_students_batch(
+    ids: List[str] = Query(..., description="Student ids, comma separated and/or repeated"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """
+    Get several students in one request.
+    
+    Results follow the order of `ids` (`?ids=3,1,2` or `?ids=3&ids=1`);
+    unknown ids are marked `found: false`.
+    """
+    try:
+        parsed = [int(part) for value in ids for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be integers"
+        )
+    if not parsed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one id is required"
+        )
+    return await fetch_batch(db, current_user.id, parsed)
+
+
+@router.post("/batch", response_model=StudentBatchResponse)
+async def post_students_batch(
+    payload: StudentBatchRequest,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserSnapshot = Depends(get_current_user)
+):
+    """Get several students in one request; the POST form of GET /students/batch for long id lists."""
+    return await fetch_batch(db, current_user.id, payload.ids)
 
 
 @router.get("/{student_id}", response_model=StudentResponse)
 async def get_student(
     student_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Get a specific student by ID."""
-    student = db.query(Student).filter(
-        Student.id == student_id,
-        Student.created_by == current_user.id
-    ).first()
+    result = await db.execute(
+        select(*STUDENT_COLUMNS).where(
+            Student.id == student_id,
+            Student.created_by == current_user.id
+        )
+    )
+    student = result.first()
     
     if not student:
         raise HTTPException(
@@ -191,78 +719,100 @@ async def get_student(
             detail="Student not found"
         )
     
-    return student
+    etag = make_etag("student", student.id, student.updated_at.isoformat())
+    headers = cache_headers(etag, student.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(headers)
+    
+    return ORJSONResponse(student_dict(student), headers=headers)
 
 
 @router.put("/{student_id}", response_model=StudentResponse)
 async def update_student(
     student_id: int,
     student_data: StudentUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """
     Update a student record.
     
     Only provide the fields you want to update.
     """
-    student = db.query(Student).filter(
-        Student.id == student_id,
-        Student.created_by == current_user.id
-    ).first()
+    update_data = student_data.model_dump(exclude_unset=True, exclude_none=True)
+    owned = and_(Student.id == student_id, Student.created_by == current_user.id)
     
-    if not student:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Student not found"
-        )
+    # Old course/city values are only needed when the facets they feed change
+    changed_facets = [facet for facet in FACETS if facet in update_data]
+    deltas = Counter()
+    if changed_facets:
+        statement = select(*(getattr(Student, facet) for facet in changed_facets)).where(owned)
+        if db.bind.dialect.name == "mysql":
+            statement = statement.with_for_update()
+        await lock_for_write(db)
+        previous = (await db.execute(statement)).first()
+        if previous is None:
+            raise student_not_found()
+        deltas = facet_deltas([previous._asdict()], -1, changed_facets)
+        deltas.update(facet_deltas([update_data], 1, changed_facets))
     
-    # Check if email is being updated and if it's already taken
-    if student_data.email and student_data.email != student.email:
-        existing_student = db.query(Student).filter(
-            Student.email == student_data.email,
-            Student.id != student_id
-        ).first()
-        if existing_student:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="A student with this email already exists"
-            )
+    # The unique index on email decides duplicates, so there is no check-then-update race
+    statement = update(Student).where(owned).values(**update_data)
+    try:
+        if not update_data:
+            # Nothing to change; leave updated_at alone
+            row = (await db.execute(select(*STUDENT_COLUMNS).where(owned))).first()
+        elif db.bind.dialect.update_returning:
+            row = (await db.execute(statement.returning(*STUDENT_COLUMNS))).first()
+        else:
+            # No RETURNING (MySQL): rowcount counts matched rows, then read the row back
+            result = await db.execute(statement)
+            row = None
+            if result.rowcount:
+                row = (await db.execute(select(*STUDENT_COLUMNS).where(owned))).first()
+    except IntegrityError as e:
+        await db.rollback()
+        if not is_unique_violation(e):
+            raise
+        raise duplicate_email()
     
-    # Update only provided fields
-    update_data = student_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(student, field, value)
+    if row is None:
+        raise student_not_found()
     
-    db.commit()
-    db.refresh(student)
+    await adjust_facets(db, current_user.id, deltas)
+    await db.commit()
+    if update_data:
+        await publish_change(current_user.id, "updated", [student_id])
     
-    return student
+    return ORJSONResponse(student_dict(row))
 
 
 @router.delete("/{student_id}", response_model=MessageResponse)
 async def delete_student(
     student_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user)
 ):
     """Delete a student record."""
-    student = db.query(Student).filter(
-        Student.id == student_id,
-        Student.created_by == current_user.id
-    ).first()
+    owned = and_(Student.id == student_id, Student.created_by == current_user.id)
+    removed_columns = (Student.name, Student.course, Student.city)
     
-    if not student:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Student not found"
-        )
+    if db.bind.dialect.delete_returning:
+        student = (await db.execute(delete(Student).where(owned).returning(*removed_columns))).first()
+    else:
+        # No RETURNING (MySQL): lock and read what the response and facets need, then delete
+        student = (await db.execute(select(*removed_columns).where(owned).with_for_update())).first()
+        if student is not None:
+            await db.execute(delete(Student).where(owned))
+    
+    if student is None:
+        raise student_not_found()
     
-    student_name = student.name
-    db.delete(student)
-    db.commit()
+    await adjust_facets(db, current_user.id, facet_deltas([student], -1))
+    await db.commit()
+    await publish_change(current_user.id, "deleted", [student_id])
     
     return MessageResponse(
         message="Student deleted successfully",
-        detail=f"Student '{student_name}' has been removed"
+        detail=f"Student '{student.name}' has been removed"
     )
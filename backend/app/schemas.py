@@ -35,6 +35,7 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     user_id: Optional[int] = None
+    exp: Optional[int] = None
 
 
 # ==================== Student Schemas ====================
@@ -74,6 +75,78 @@ class StudentListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+class BulkRowError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    errors: List[str]
+
+
+class BulkImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[BulkRowError]
+    elapsed_ms: float
+    rows_per_second: float
+
+
+class StudentSelection(BaseModel):
+    ids: Optional[List[int]] = Field(None, max_length=10000)
+    search: Optional[str] = None
+    course: Optional[str] = None
+    city: Optional[str] = None
+
+
+class StudentBulkUpdate(StudentSelection):
+    changes: StudentUpdate
+
+
+class BulkWriteResponse(BaseModel):
+    affected: int
+
+
+class StudentBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1)
+
+
+class StudentBatchItem(BaseModel):
+    id: int
+    found: bool
+    student: Optional[StudentResponse] = None
+
+
+class StudentBatchResponse(BaseModel):
+    results: List[StudentBatchItem]
+    missing: List[int]
+
+
+class FacetValue(BaseModel):
+    value: str
+    count: int
+
+
+class FacetsResponse(BaseModel):
+    courses: List[FacetValue]
+    cities: List[FacetValue]
+
+
+class AgeBucket(BaseModel):
+    min_age: int
+    max_age: int
+    count: int
+
+
+class StudentSummaryResponse(BaseModel):
+    total: int
+    course_count: int
+    city_count: int
+    top_courses: List[FacetValue]
+    top_cities: List[FacetValue]
+    age_histogram: List[AgeBucket]
+    recent: List[StudentResponse]
 
 
 # ==================== Message Schemas ====================
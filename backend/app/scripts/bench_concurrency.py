@@ -0,0 +1,108 @@
+"""Measure request latency under many concurrent clients.
+
+Drives the app in-process over an ASGI transport with `--clients` concurrent
+clients, each alternating a paged `/students` list with the cheap `/health`
+endpoint, and prints p50/p95/p99 per endpoint. A blocking database layer
+shows up as `/health` latency tracking the slowest `/students` query.
+
+Usage (from backend/app):
+    python scripts/bench_concurrency.py [--clients 200] [--requests 10] [--students 20000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+
+import httpx
+from sqlalchemy import insert
+from database import Base, engine
+from models import User, Student
+from auth import create_access_token
+
+
+def seed(students: int) -> str:
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "email": "bench@example.com", "name": "Bench", "hashed_password": "x"}])
+        conn.execute(insert(Student), [
+            {
+                "name": f"Student {i}",
+                "email": f"student{i}@example.com",
+                "age": 18 + i % 10,
+                "course": f"Course {i % 12}",
+                "city": f"City {i % 30}",
+                "created_by": 1,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(students)
+        ])
+    return create_access_token({"sub": "1"})
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(clients: int, requests: int, token: str) -> dict:
+    import main
+
+    latencies = {"/api/v1/students": [], "/health": []}
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=main.app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(seed_value: int):
+            rng = random.Random(seed_value)
+            for _ in range(requests):
+                for path, params in (
+                    ("/api/v1/students", {"page": rng.randint(1, 200), "page_size": 20, "city": f"City {rng.randint(0, 29)}"}),
+                    ("/health", None),
+                ):
+                    start = time.perf_counter()
+                    response = await client.get(path, params=params, headers=headers)
+                    response.raise_for_status()
+                    latencies[path].append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    return {"elapsed": elapsed, "latencies": latencies}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=10, help="Request pairs per client")
+    parser.add_argument("--students", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = seed(args.students)
+    result = asyncio.run(run(args.clients, args.requests, token))
+
+    total = sum(len(samples) for samples in result["latencies"].values())
+    print(f"{args.clients} clients, {total} requests in {result['elapsed']:.2f}s ({total / result['elapsed']:.0f} req/s)")
+    print(f"{'endpoint':<20} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for path, samples in result["latencies"].items():
+        print(
+            f"{path:<20} {statistics.median(samples):>10.1f} "
+            f"{percentile(samples, 95):>10.1f} {percentile(samples, 99):>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
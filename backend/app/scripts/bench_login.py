@@ -0,0 +1,102 @@
+"""Measure login throughput with bcrypt running in the hashing pool.
+
+Fires `--logins` logins with `--concurrency` in flight while a probe keeps
+hitting `/health`, then prints logins/sec, logins/sec per hashing worker,
+503 rejections and the probe's latency (which stays flat when bcrypt is
+kept off the event loop).
+
+Usage (from backend/app):
+    python scripts/bench_login.py [--workers 2] [--logins 200] [--concurrency 50] [--rounds 12]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="PASSWORD_HASH_WORKERS")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    os.environ["PASSWORD_HASH_QUEUE_SIZE"] = str(args.concurrency)
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["AUTH_RATE_LIMIT_ENABLED"] = "false"  # every login comes from one client address
+    os.environ["ADMISSION_ENABLED"] = "false"  # measure the hashing pool's own queue
+
+    import httpx
+    from sqlalchemy import insert
+    from database import Base, engine
+    from models import User
+    from hashing import get_password_hash, shutdown_executor
+    import main as app_main
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "email": "bench@example.com",
+            "name": "Bench",
+            "hashed_password": get_password_hash("benchmark"),
+        }])
+
+    async def run():
+        transport = httpx.ASGITransport(app=app_main.app)
+        statuses = []
+        probe_ms = []
+        done = asyncio.Event()
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            # Warm up the worker processes so spawn cost is not measured
+            await client.post("/api/v1/auth/login", json={"email": "bench@example.com", "password": "benchmark"})
+
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def login():
+                async with semaphore:
+                    response = await client.post(
+                        "/api/v1/auth/login",
+                        json={"email": "bench@example.com", "password": "benchmark"}
+                    )
+                    statuses.append(response.status_code)
+
+            async def probe():
+                while not done.is_set():
+                    start = time.perf_counter()
+                    await client.get("/health")
+                    probe_ms.append((time.perf_counter() - start) * 1000)
+                    await asyncio.sleep(0.01)
+
+            probe_task = asyncio.create_task(probe())
+            started = time.perf_counter()
+            await asyncio.gather(*(login() for _ in range(args.logins)))
+            elapsed = time.perf_counter() - started
+            done.set()
+            await probe_task
+
+        return elapsed, statuses, probe_ms
+
+    elapsed, statuses, probe_ms = asyncio.run(run())
+    shutdown_executor()
+
+    ok = statuses.count(200)
+    rejected = statuses.count(503)
+    per_worker = ok / elapsed / max(args.workers, 1)
+    print(f"workers={args.workers} rounds={args.rounds} concurrency={args.concurrency}")
+    print(f"{ok} logins in {elapsed:.2f}s: {ok / elapsed:.1f}/s, {per_worker:.1f}/s per worker, {rejected} rejected (503)")
+    print(f"/health during flood: p50 {statistics.median(probe_ms):.1f}ms, max {max(probe_ms):.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
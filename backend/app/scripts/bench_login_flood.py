@@ -0,0 +1,165 @@
+"""Measure student read latency while /auth/login is flooded.
+
+Seeds one reader with students and `--victims` accounts, then for each phase
+keeps `--readers` clients paging through `GET /api/v1/students` while
+measuring their latency:
+
+  baseline  - no login traffic
+  flood     - `--attackers` clients spread over `--ips` addresses post wrong
+              passwords for the victim accounts at `--rate` attempts/s in
+              total, with the limiter off
+  throttled - the same flood with AUTH_RATE_LIMIT_ENABLED on
+
+The flood is paced to a fixed rate like a remote attacker rather than looping
+as fast as the in-process transport allows, which would only measure the
+benchmark's own event loop contention. Read latency under the flood should
+stay close to the baseline. Flood requests beyond what bcrypt can serve are
+answered 429 by the limiter or 503 by admission control; with few addresses
+the admission gate sheds most of them before the limiter is reached.
+
+Usage (from backend/app):
+    python scripts/bench_login_flood.py [--duration 5] [--warmup 5] [--attackers 50] [--rate 200] [--ips 4] [--rounds 12]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=5, help="Measured seconds per phase")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before each phase, so the limiters' burst allowance is spent")
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--attackers", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=200, help="Login attempts per second across all attackers")
+    parser.add_argument("--ips", type=int, default=4, help="Client addresses the flood comes from")
+    parser.add_argument("--victims", type=int, default=200, help="Accounts the flood targets")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="PASSWORD_HASH_WORKERS")
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp.name, 'flood.db')}"
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["RESULT_CACHE_BACKEND"] = "none"  # make every read hit the database
+
+    import httpx
+    from sqlalchemy import insert
+    from config import settings
+    from database import engine
+    from facets import rebuild_facets
+    from hashing import get_password_hash, shutdown_executor
+    from migrations import init_db
+    from models import Student, User
+    from rate_limit import email_limiter, ip_limiter
+    import main as app_main
+
+    init_db()  # the ASGI transport does not run the app's lifespan
+    hashed = get_password_hash("benchmark")
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"user{i}@example.com", "name": f"User {i}", "hashed_password": hashed}
+            for i in range(args.victims + 1)
+        ])
+        conn.execute(insert(Student), [
+            {"name": f"Student {i}", "email": f"student{i}@example.com", "age": 18 + i % 10,
+             "course": f"Course {i % 7}", "city": f"City {i % 11}", "created_by": 1}
+            for i in range(args.students)
+        ])
+        rebuild_facets(conn)
+
+    async def run_phase(app, token: str, flood: bool) -> tuple:
+        read_ms = []
+        statuses = Counter()
+        done = asyncio.Event()
+        clients = [
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=(f"10.0.0.{i + 1}", 4000)),
+                              base_url="http://bench", timeout=None)
+            for i in range(args.ips)
+        ]
+        reader = httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=("10.1.0.1", 4000)),
+                                   base_url="http://bench", timeout=None,
+                                   headers={"Authorization": f"Bearer {token}"})
+
+        measure_from = time.perf_counter() + args.warmup
+
+        async def read():
+            page = 1
+            while not done.is_set():
+                start = time.perf_counter()
+                response = await reader.get("/api/v1/students", params={"page": page, "page_size": 20})
+                response.raise_for_status()
+                if start >= measure_from:
+                    read_ms.append((time.perf_counter() - start) * 1000)
+                page = page % 50 + 1
+                await asyncio.sleep(0.005)
+
+        async def attack(n: int):
+            client = clients[n % len(clients)]
+            attempt = 0
+            interval = args.attackers / args.rate
+            next_at = time.perf_counter() + interval * n / args.attackers
+            while not done.is_set():
+                await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+                next_at += interval
+                attempt += 1
+                response = await client.post("/api/v1/auth/login", json={
+                    "email": f"user{1 + (n * 7919 + attempt) % args.victims}@example.com",
+                    "password": f"guess-{attempt}",
+                })
+                if time.perf_counter() >= measure_from:
+                    statuses[response.status_code] += 1
+
+        tasks = [asyncio.create_task(read()) for _ in range(args.readers)]
+        if flood:
+            tasks += [asyncio.create_task(attack(i)) for i in range(args.attackers)]
+        await asyncio.sleep(args.warmup + args.duration)
+        done.set()
+        await asyncio.gather(*tasks)
+        for client in (*clients, reader):
+            await client.aclose()
+        return read_ms, statuses
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app_main.app), base_url="http://bench") as client:
+            response = await client.post("/api/v1/auth/login", json={"email": "user0@example.com", "password": "benchmark"})
+            token = response.json()["access_token"]
+
+        results = {}
+        for name, flood, limited in (("baseline", False, True), ("flood", True, False), ("throttled", True, True)):
+            settings.AUTH_RATE_LIMIT_ENABLED = limited
+            for limiter in (ip_limiter, email_limiter):
+                limiter.clear()
+            results[name] = await run_phase(app_main.app, token, flood)
+        return results
+
+    results = asyncio.run(run())
+    shutdown_executor()
+
+    print(f"workers={args.workers} rounds={args.rounds} attackers={args.attackers} rate={args.rate:g}/s ips={args.ips} duration={args.duration}s/phase")
+    print(f"{'phase':<10} {'reads':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}   login responses")
+    for name, (read_ms, statuses) in results.items():
+        logins = ", ".join(f"{code}: {count}" for code, count in sorted(statuses.items())) or "-"
+        print(
+            f"{name:<10} {len(read_ms):>7} {statistics.median(read_ms):>8.1f} {percentile(read_ms, 0.95):>8.1f} "
+            f"{percentile(read_ms, 0.99):>8.1f} {max(read_ms):>8.1f}   {logins}"
+        )
+
+
+if __name__ == "__main__":
+    main()
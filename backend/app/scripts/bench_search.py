@@ -0,0 +1,101 @@
+"""Benchmark the `search` parameter: leading-wildcard ILIKE vs the full-text index.
+
+Each search counts its matches and reads the newest page; `ranked ms` reads the
+page in relevance order instead.
+
+Usage (from backend/app):
+    python scripts/bench_search.py [sizes]
+
+`sizes` is a comma separated list of student counts (default 10000,100000,1000000).
+Each size is seeded into a throwaway SQLite database.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+from database import Base
+from models import User, Student
+import search
+
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Kavya", "Rohan", "Sneha", "Vikram", "Ananya", "Arjun", "Meera"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Reddy", "Gupta", "Nair", "Joshi", "Kulkarni", "Das", "Singh"]
+COURSES = ["Computer Science", "Mechanical", "Electronics", "Civil", "Mathematics", "Physics", "Biology"]
+CITIES = ["Pune", "Mumbai", "Delhi", "Bengaluru", "Chennai", "Hyderabad", "Kolkata", "Jaipur"]
+QUERIES = ["kavya", "pune", "mech", "sharma physics", "student123"]
+REPEATS = 5
+
+
+def seed(engine, size: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(size)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "email": "bench@example.com", "name": "Bench", "hashed_password": "x"}])
+        batch = []
+        for i in range(size):
+            batch.append({
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "email": f"student{i}@example.com",
+                "age": rng.randint(17, 30),
+                "course": rng.choice(COURSES),
+                "city": rng.choice(CITIES),
+                "created_by": 1,
+                "created_at": now,
+                "updated_at": now,
+            })
+            if len(batch) == 10000:
+                conn.execute(insert(Student), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Student), batch)
+
+
+def time_search(Session, term: str, use_index: bool, ranked: bool = False) -> float:
+    backend = search._backend
+    if not use_index:
+        search._backend = None
+    try:
+        best = float("inf")
+        for _ in range(REPEATS):
+            with Session() as db:
+                start = time.perf_counter()
+                query, rank = search.apply_search(select(Student).where(Student.created_by == 1), term, ranked)
+                db.scalar(query.with_only_columns(func.count(Student.id)))
+                order = (rank, Student.id) if ranked else (Student.created_at.desc(), Student.id.desc())
+                db.execute(query.order_by(*order).limit(10)).all()
+                best = min(best, time.perf_counter() - start)
+        return best * 1000
+    finally:
+        search._backend = backend
+
+
+def main():
+    sizes = [int(s) for s in (sys.argv[1] if len(sys.argv) > 1 else "10000,100000,1000000").split(",")]
+    print(f"{'students':>10} {'query':>16} {'ilike ms':>10} {'index ms':>10} {'speedup':>8} {'ranked ms':>10}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            seed(engine, size)
+            backend = search.ensure_search_index(engine)
+            if backend is None:
+                print("Full-text search is not available for this SQLite build")
+                return
+            Session = sessionmaker(bind=engine)
+            for term in QUERIES:
+                ilike_ms = time_search(Session, term, use_index=False)
+                index_ms = time_search(Session, term, use_index=True)
+                ranked_ms = time_search(Session, term, use_index=True, ranked=True)
+                print(f"{size:>10} {term:>16} {ilike_ms:>10.2f} {index_ms:>10.2f} {ilike_ms / index_ms:>7.1f}x {ranked_ms:>10.2f}")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
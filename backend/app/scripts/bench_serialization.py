@@ -0,0 +1,105 @@
+"""Benchmark per-page serialization of GET /students.
+
+Compares the old path (hydrate ORM objects, validate them into
+`StudentListResponse`, `model_dump_json`) with the trusted-output path
+(select the response columns, build plain dicts, encode with orjson).
+Both the query and the encoding are included; the count query is not.
+
+Usage (from backend/app):
+    python scripts/bench_serialization.py [page_size] [repeats]
+
+Defaults to 100-row pages, 500 repeats, on a throwaway SQLite database.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from database import Base
+from models import User, Student
+from schemas import StudentListResponse
+from serialization import STUDENT_COLUMNS, dumps, student_dict
+
+
+def seed(engine, size: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"id": 1, "email": "bench@example.com", "name": "Bench", "hashed_password": "x"}])
+        conn.execute(insert(Student), [
+            {
+                "name": f"Student {i}",
+                "email": f"student{i}@example.com",
+                "age": 18 + i % 12,
+                "course": f"Course {i % 9}",
+                "city": f"City {i % 23}",
+                "created_by": 1,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(size)
+        ])
+
+
+def orm_page(Session, page_size: int) -> bytes:
+    with Session() as db:
+        students = db.execute(
+            select(Student).where(Student.created_by == 1).order_by(Student.id).limit(page_size)
+        ).scalars().all()
+        response = StudentListResponse(students=students, total=page_size, page=1, page_size=page_size, total_pages=1)
+        return response.model_dump_json().encode("utf-8")
+
+
+def projected_page(Session, page_size: int) -> bytes:
+    with Session() as db:
+        rows = db.execute(
+            select(*STUDENT_COLUMNS).where(Student.created_by == 1).order_by(Student.id).limit(page_size)
+        ).all()
+        return dumps({
+            "students": [student_dict(row) for row in rows],
+            "total": page_size,
+            "page": 1,
+            "page_size": page_size,
+            "total_pages": 1,
+            "next_cursor": None,
+            "prev_cursor": None,
+        })
+
+
+def measure(fn, Session, page_size: int, repeats: int) -> float:
+    fn(Session, page_size)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(Session, page_size)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        seed(engine, page_size)
+        Session = sessionmaker(bind=engine)
+
+        old, new = orm_page(Session, page_size), projected_page(Session, page_size)
+        assert StudentListResponse.model_validate_json(old) == StudentListResponse.model_validate_json(new)
+
+        orm_ms = measure(orm_page, Session, page_size, repeats)
+        projected_ms = measure(projected_page, Session, page_size, repeats)
+        engine.dispose()
+
+    print(f"{page_size}-row page, {repeats} repeats")
+    print(f"  ORM + model_dump_json:  {orm_ms:7.3f} ms/page")
+    print(f"  columns + orjson:       {projected_ms:7.3f} ms/page  ({orm_ms / projected_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Measure worker cold start: importing `main` and serving the first request.
+
+Each sample runs in a fresh interpreter (like a newly spawned uvicorn worker)
+and records:
+  import  - `import main`
+  startup - the lifespan startup hook (schema bootstrap when enabled)
+  first   - the first `/health` response after startup
+
+Scenarios: an empty database with INIT_DB_ON_STARTUP on, and an already
+initialised database with it on and off.
+
+Usage (from backend/app):
+    python scripts/bench_startup.py [--runs 7]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(main.app)
+ready_start = time.perf_counter()
+client.__enter__()
+ready = time.perf_counter()
+client.get("/health").raise_for_status()
+served = time.perf_counter()
+client.__exit__(None, None, None)
+print(json.dumps({
+    "import": (imported - start) * 1000,
+    "startup": (ready - ready_start) * 1000,
+    "first": (served - ready) * 1000,
+}))
+"""
+
+
+def sample(database: str, init_on_startup: bool) -> dict:
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        "INIT_DB_ON_STARTUP": str(init_on_startup).lower(),
+        "PASSWORD_HASH_WORKERS": "0",
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=APP_DIR, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        initialised = os.path.join(tmp, "initialised.db")
+        sample(initialised, init_on_startup=True)
+
+        scenarios = {
+            "empty db, init on startup": lambda run: sample(os.path.join(tmp, f"empty{run}.db"), True),
+            "initialised db, init on startup": lambda run: sample(initialised, True),
+            "initialised db, init-db skipped": lambda run: sample(initialised, False),
+        }
+
+        print(f"median of {args.runs} fresh interpreters, ms")
+        print(f"{'scenario':<34} {'import':>8} {'startup':>8} {'first':>8} {'total':>8}")
+        for name, run_sample in scenarios.items():
+            samples = [run_sample(run) for run in range(args.runs)]
+            medians = {key: statistics.median(s[key] for s in samples) for key in ("import", "startup", "first")}
+            total = sum(medians.values())
+            print(f"{name:<34} {medians['import']:>8.1f} {medians['startup']:>8.1f} {medians['first']:>8.1f} {total:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Consistency check for the in-process student change feed.
+
+Exercises `events.ChangeFeed` directly (no database or server): channel
+eviction when every buffered user has an open stream, Last-Event-ID replay,
+resets for ids that can no longer be replayed, and slow-subscriber overflow.
+Fails when any of them misbehaves.
+
+Usage (from backend/app):
+    python scripts/check_change_feed.py
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ["EVENTS_BUFFER_SIZE"] = "4"
+os.environ["EVENTS_QUEUE_SIZE"] = "3"
+
+from events import ChangeFeed
+
+
+def check(name: str, ok: bool, detail: str = "") -> bool:
+    print(f"{'ok  ' if ok else 'FAIL'} {name}{f': {detail}' if detail and not ok else ''}")
+    return ok
+
+
+def check_full_feed() -> list:
+    """Every channel has a stream: publishing or subscribing for a new user must still work"""
+    feed = ChangeFeed(max_users=2)
+    streams = [feed.subscribe(user_id, None) for user_id in (1, 2)]
+    results = []
+    try:
+        feed.publish(3, "created", "v", [1])
+        results.append(check("publish for a new user with every channel subscribed", True))
+    except Exception as e:
+        results.append(check("publish for a new user with every channel subscribed", False, repr(e)))
+    try:
+        streams.append(feed.subscribe(4, None))
+        results.append(check("subscribe a new user with every channel subscribed", True))
+    except Exception as e:
+        results.append(check("subscribe a new user with every channel subscribed", False, repr(e)))
+
+    for stream in streams:
+        feed.unsubscribe(stream)
+    feed.publish(5, "created", "v", [1])
+    results.append(check(
+        "channels without streams are evicted back to max_users",
+        feed.stats()["users"] == 2, str(feed.stats()),
+    ))
+    evicted = feed.subscribe(1, feed.event_id(0))
+    results.append(check("resuming an evicted user resets", evicted.reset_at is not None))
+    return results
+
+
+def check_replay() -> list:
+    feed = ChangeFeed(max_users=10)
+    for student_id in range(1, 4):
+        feed.publish(1, "created", "v", [student_id])
+    resumed = feed.subscribe(1, feed.event_id(1))
+    results = [check(
+        "Last-Event-ID replays later events",
+        [event.seq for event in resumed.pending] == [2, 3] and resumed.reset_at is None,
+        str([event.seq for event in resumed.pending]),
+    )]
+    for student_id in range(4, 8):
+        feed.publish(1, "updated", "v", [student_id])
+    results.append(check("ids older than the buffer reset", feed.subscribe(1, feed.event_id(1)).reset_at is not None))
+    results.append(check("ids from another process reset", feed.subscribe(1, "other-1").reset_at is not None))
+    return results
+
+
+def check_overflow() -> list:
+    feed = ChangeFeed(max_users=10)
+    stream = feed.subscribe(1, None)
+    for student_id in range(1, 6):
+        feed.publish(1, "updated", "v", [student_id])
+    return [check(
+        "a subscriber that falls behind is reset instead of queueing without bound",
+        stream.reset_at == 4 and len(stream.pending) == 1,
+        f"reset_at={stream.reset_at} pending={len(stream.pending)}",
+    )]
+
+
+def main():
+    results = check_full_feed() + check_replay() + check_overflow()
+    failures = results.count(False)
+    print(f"{failures} check(s) failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Query-count budget check for the API endpoints.
+
+Drives each endpoint through the app in-process against a throwaway SQLite
+database and fails when a request runs more SQL statements than its budget
+(see `query_stats.query_budget`). Bulk endpoints are called with enough rows
+that a per-row query would blow the budget.
+
+Usage (from backend/app):
+    python scripts/check_query_budgets.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'budgets.db')}"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import httpx
+from migrations import init_db
+from query_stats import query_budget
+
+BULK_ROWS = 50
+
+
+def student(i: int) -> dict:
+    return {"name": f"Student {i}", "email": f"student{i}@example.com", "age": 20, "course": f"Course {i % 3}", "city": f"City {i % 4}"}
+
+
+async def check(client: httpx.AsyncClient, budget: int, method: str, path: str, **kwargs) -> bool:
+    try:
+        with query_budget(budget) as seen:
+            response = await client.request(method, path, **kwargs)
+    except AssertionError as e:
+        print(f"FAIL {e}")
+        return False
+    response.raise_for_status()
+    print(f"ok   {method} {path}: {seen[0].count}/{budget} queries")
+    return True
+
+
+async def run() -> int:
+    import main
+
+    init_db()  # the ASGI transport does not run the app's lifespan
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budgets") as client:
+        credentials = {"email": "owner@example.com", "password": "secret123"}
+        results = [
+            await check(client, 3, "POST", "/api/v1/auth/register", json={**credentials, "name": "Owner"}),
+            await check(client, 1, "POST", "/api/v1/auth/login", json=credentials),
+        ]
+        token = (await client.post("/api/v1/auth/login", json=credentials)).json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+
+        students = [student(i) for i in range(BULK_ROWS)]
+        # Writes that move facet counts start with BEGIN IMMEDIATE on SQLite (facets.lock_for_write)
+        results += [
+            await check(client, 1, "GET", "/api/v1/auth/me"),
+            await check(client, 2, "POST", "/api/v1/students", json=student(BULK_ROWS)),
+            await check(client, 3, "POST", "/api/v1/students/bulk", json=students),
+            await check(client, 2, "GET", "/api/v1/students", params={"page_size": 20}),
+            await check(client, 2, "GET", "/api/v1/students", params={"search": "student", "sort_by": "name"}),
+            await check(client, 1, "GET", "/api/v1/students/all"),
+            await check(client, 1, "GET", "/api/v1/students/facets"),
+            await check(client, 1, "GET", "/api/v1/students/courses"),
+            await check(client, 1, "GET", "/api/v1/students/cities"),
+            await check(client, 2, "GET", "/api/v1/students/summary"),
+            await check(client, 1, "GET", "/api/v1/students/1"),
+            await check(client, 1, "GET", "/api/v1/students/batch", params={"ids": ",".join(map(str, range(1, BULK_ROWS)))}),
+            await check(client, 5, "PUT", "/api/v1/students/1", json={"email": "moved@example.com", "city": "City 9"}),
+            await check(client, 3, "DELETE", "/api/v1/students/2"),
+            await check(client, 5, "PATCH", "/api/v1/students/bulk", json={"search": "student", "changes": {"city": "City 8"}}),
+            await check(client, 6, "DELETE", "/api/v1/students/bulk", json={"course": "Course 1"}),
+        ]
+    return results.count(False)
+
+
+def main():
+    failures = asyncio.run(run())
+    print(f"{failures} endpoint(s) over budget")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Query-plan regression check for the student read endpoints.
+
+Seeds a throwaway SQLite database, drives every query shape `get_students`
+can generate (each sort field and direction, page and cursor mode, with and
+without filters) plus the other student reads through the app in-process,
+captures the SQL that reaches the database and runs EXPLAIN QUERY PLAN on it.
+
+Exits non-zero when a query full-scans `students`/`student_facets`, sorts
+with a temp B-tree, runs a cursor page without seeking the index to the
+cursor position, or scans the full-text index once per `students` row.
+Full-text searches whose match set drives the query (students looked up by
+rowid) are exempt from the sort and seek checks: the sort only covers the
+matches, and no owner index can order them.
+
+Usage (from backend/app):
+    python scripts/check_query_plans.py [--verbose]
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'plans.db')}"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+import httpx
+from sqlalchemy import event, insert, text
+from database import async_engine, engine
+from models import User, Student
+from auth import create_access_token
+from facets import rebuild_facets
+from migrations import init_db
+
+SORT_FIELDS = ["name", "email", "age", "course", "city", "created_at", "updated_at"]
+FILTERS = [{}, {"course": "Course 3"}, {"city": "City 7"}, {"search": "student"}]
+WATCHED_TABLES = ("students", "student_facets")
+
+FULL_SCAN = re.compile(rf"^SCAN ({'|'.join(WATCHED_TABLES)})\b")
+TEMP_SORT = "USE TEMP B-TREE FOR ORDER BY"
+KEYSET = re.compile(r"students\.(\w+) [<>]= \? AND \(students\.\1 [<>] \?")
+STUDENTS_LOOP = re.compile(r"^(SCAN|SEARCH) students\b")
+FTS_SCAN = re.compile(r"^SCAN students_fts\b")
+STUDENTS_BY_ROWID = re.compile(r"^SEARCH students USING INTEGER PRIMARY KEY \(rowid=\?\)")
+
+
+def fts_per_row(rows) -> list:
+    """Full-text scans nested inside a loop over students (same plan level, later in join order)"""
+    outer = set()
+    problems = []
+    for _, parent, _, detail in rows:
+        if FTS_SCAN.match(detail) and parent in outer:
+            problems.append(f"{detail} runs once per students row")
+        if STUDENTS_LOOP.match(detail):
+            outer.add(parent)
+    return problems
+
+
+def seed() -> str:
+    init_db()
+
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": user_id, "email": f"owner{user_id}@example.com", "name": f"Owner {user_id}", "hashed_password": "x"}
+            for user_id in range(1, 6)
+        ])
+        conn.execute(insert(Student), [
+            {
+                "name": f"Student {i}",
+                "email": f"student{i}@example.com",
+                "age": 18 + i % 12,
+                "course": f"Course {i % 9}",
+                "city": f"City {i % 23}",
+                "created_by": 1 + i % 5,
+                "created_at": now - timedelta(minutes=i),
+                "updated_at": now - timedelta(minutes=i % 97),
+            }
+            for i in range(5000)
+        ])
+        rebuild_facets(conn)
+        # No ANALYZE: the app never runs it, so production plans come from the default estimates
+    return create_access_token({"sub": "1"})
+
+
+async def exercise(token: str) -> None:
+    import main
+
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://plans") as client:
+        async def get(path, **params):
+            response = await client.get(path, params=params, headers=headers)
+            response.raise_for_status()
+            return response.json()
+
+        for sort_by in SORT_FIELDS:
+            for sort_order in ("asc", "desc"):
+                for filters in FILTERS:
+                    params = {"sort_by": sort_by, "sort_order": sort_order, "page_size": 20, **filters}
+                    first = await get("/api/v1/students", **params)
+                    await get("/api/v1/students", page=3, **params)
+                    if first["next_cursor"]:
+                        second = await get("/api/v1/students", cursor=first["next_cursor"], **params)
+                        if second["prev_cursor"]:
+                            await get("/api/v1/students", cursor=second["prev_cursor"], **params)
+
+        await get("/api/v1/students", search="student", sort_by="relevance")
+        await get("/api/v1/students/all")
+        await get("/api/v1/students/facets")
+        await get("/api/v1/students/courses")
+        await get("/api/v1/students/cities")
+        await get("/api/v1/students/1")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    token = seed()
+
+    captured = {}
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and any(t in statement for t in WATCHED_TABLES):
+            captured.setdefault(statement, parameters)
+
+    asyncio.run(exercise(token))
+
+    failures = 0
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for statement, parameters in captured.items():
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            rows = cursor.fetchall()
+            plan = [row[3] for row in rows]
+            problems = [line for line in plan if FULL_SCAN.match(line)] + fts_per_row(rows)
+            fts_driven = any(FTS_SCAN.match(line) for line in plan) and any(STUDENTS_BY_ROWID.match(line) for line in plan)
+            if not fts_driven:
+                problems += [line for line in plan if TEMP_SORT in line]
+                keyset = KEYSET.search(statement)
+                if keyset and not any(re.search(rf"\b{keyset.group(1)}[<>]", line) for line in plan):
+                    problems.append("cursor page does not seek the index")
+            if problems or args.verbose:
+                print("FAIL" if problems else "ok", " ".join(statement.split()))
+                for line in plan:
+                    print(f"    {line}")
+            failures += bool(problems)
+    finally:
+        raw.close()
+
+    print(f"{len(captured)} query shapes checked, {failures} with plan problems")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Consistency check for the shared (redis) result cache backend.
+
+Runs `result_cache.SharedBackend` against a small dict-backed stand-in for a
+redis.asyncio client (bytes keys and values, like redis returns them), so it
+needs neither a redis server nor the `redis` package. Covers get/set with a
+TTL, counters, `ResultCache.bump`, `create_backend()` with
+RESULT_CACHE_BACKEND=redis, and `drop_entries()` keeping generations. Fails
+when any of them misbehaves.
+
+Usage (from backend/app):
+    python scripts/check_result_cache.py
+"""
+import asyncio
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import settings
+from result_cache import ResultCache, SharedBackend, create_backend
+
+
+def _encode(value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode("utf-8")
+
+
+class DictRedis:
+    """The subset of redis.asyncio.Redis that SharedBackend uses, kept in a dict"""
+
+    def __init__(self):
+        self.data: dict[bytes, bytes] = {}
+        self.ttls: dict[bytes, int] = {}
+
+    async def get(self, key):
+        return self.data.get(_encode(key))
+
+    async def set(self, key, value, ex=None):
+        key = _encode(key)
+        self.data[key] = _encode(value)
+        if ex is None:
+            self.ttls.pop(key, None)
+        else:
+            self.ttls[key] = ex
+        return True
+
+    async def incr(self, key):
+        key = _encode(key)
+        value = int(self.data.get(key, b"0")) + 1
+        self.data[key] = _encode(value)
+        return value
+
+    async def delete(self, *keys):
+        removed = 0
+        for key in map(_encode, keys):
+            removed += self.data.pop(key, None) is not None
+            self.ttls.pop(key, None)
+        return removed
+
+    async def scan_iter(self, match=None, count=None):
+        for key in list(self.data):
+            yield key
+
+
+def check(name: str, ok: bool, detail: str = "") -> bool:
+    print(f"{'ok  ' if ok else 'FAIL'} {name}{f': {detail}' if detail and not ok else ''}")
+    return ok
+
+
+async def check_entries() -> list:
+    client = DictRedis()
+    backend = SharedBackend(client, ttl=30)
+    await backend.set("students:1:1.:abc", b"payload")
+    return [
+        check("set/get round-trips bytes", await backend.get("students:1:1.:abc") == b"payload"),
+        check("entries are written with the TTL", client.ttls.get(b"students:1:1.:abc") == 30, str(client.ttls)),
+        check("missing entries read as None", await backend.get("students:1:1.:missing") is None),
+    ]
+
+
+async def check_counters() -> list:
+    client = DictRedis()
+    cache = ResultCache(SharedBackend(client, ttl=30))
+    before, modified = await cache.version(1)
+    await cache.bump(1)
+    generation = await cache.bump(1)
+    after, modified_after = await cache.version(1)
+    return [
+        check("unknown users start at generation 0", before == "0." and modified is None, f"{before} {modified}"),
+        check("bump increments the generation", generation == 2 and after == "2.", f"{generation} {after}"),
+        check("bump records the write time", bool(modified_after)),
+        check("counters carry no TTL", b"gen:1" not in client.ttls and b"mtime:1" not in client.ttls, str(client.ttls)),
+    ]
+
+
+async def check_drop_entries() -> list:
+    client = DictRedis()
+    cache = ResultCache(SharedBackend(client, ttl=30))
+    await cache.bump(1)
+    await cache.bump(2)
+    version, _ = await cache.version(1)
+    key = cache.key(1, "students", ("page", 1), version)
+    await cache.set(key, b"payload")
+    await cache.drop_entries()
+    after, modified = await cache.version(1)
+    return [
+        check("drop_entries removes cached responses", await cache.get(key) is None),
+        check("drop_entries keeps generations", after == version and bool(modified), f"{version} -> {after}"),
+        check("drop_entries keeps other users' generations", await cache.backend.get_counter("gen:2") == 1),
+        check("a bump after drop_entries moves past the old version", await cache.bump(1) == 2),
+    ]
+
+
+async def check_create_backend() -> list:
+    client = DictRedis()
+    urls = []
+
+    def from_url(url):
+        urls.append(url)
+        return client
+
+    package = types.ModuleType("redis")
+    package.asyncio = types.SimpleNamespace(from_url=from_url)
+    saved = {name: sys.modules.get(name) for name in ("redis", "redis.asyncio")}
+    sys.modules["redis"] = package
+    sys.modules["redis.asyncio"] = package.asyncio
+    backend_setting = settings.RESULT_CACHE_BACKEND
+    settings.RESULT_CACHE_BACKEND = "redis"
+    try:
+        backend = create_backend()
+    finally:
+        settings.RESULT_CACHE_BACKEND = backend_setting
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+    return [check(
+        "RESULT_CACHE_BACKEND=redis builds a SharedBackend on RESULT_CACHE_URL",
+        isinstance(backend, SharedBackend) and backend.client is client and urls == [settings.RESULT_CACHE_URL]
+        and backend.ttl == settings.RESULT_CACHE_TTL,
+        f"{type(backend).__name__} {urls}",
+    )]
+
+
+async def run() -> list:
+    return (
+        await check_entries() + await check_counters()
+        + await check_drop_entries() + await check_create_backend()
+    )
+
+
+def main():
+    results = asyncio.run(run())
+    failures = results.count(False)
+    print(f"{failures} check(s) failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,46 @@
+"""Delete all users and students (or one user's students) in small chunks.
+
+Uses the same chunked purge as POST /api/v1/admin/clear-db, so it is safe to
+run against a database that is serving traffic.
+
+Usage (from backend/app):
+    python scripts/clear_db.py [user_id]
+"""
+import asyncio
 import sys
-from sqlalchemy import text
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 try:
     from database import engine
+    from purge import start_purge
 except Exception as e:
     print(f"Failed to import database engine: {e}")
     sys.exit(1)
 
 
-def clear_mysql():
-    with engine.begin() as conn:
-        # Disable FK checks, truncate tables, then re-enable
-        conn.execute(text("SET FOREIGN_KEY_CHECKS=0"))
-        conn.execute(text("TRUNCATE TABLE students"))
-        conn.execute(text("TRUNCATE TABLE users"))
-        conn.execute(text("SET FOREIGN_KEY_CHECKS=1"))
-    print("MySQL: Truncated tables students, users and reset AUTO_INCREMENT.")
-
-
-def clear_sqlite():
-    with engine.begin() as conn:
-        conn.execute(text("DELETE FROM students"))
-        conn.execute(text("DELETE FROM users"))
-        # Reset autoincrement sequence
-        try:
-            conn.execute(text("DELETE FROM sqlite_sequence WHERE name IN ('students','users')"))
-        except Exception:
-            pass
-    print("SQLite: Deleted all rows from students and users; sequence reset where applicable.")
+async def purge(user_id):
+    job = start_purge(user_id)
+    while not job.task.done():
+        await asyncio.sleep(1)
+        progress = job.to_dict()
+        print(f"  {progress['students_deleted']}/{progress['students_total']} students, {progress['rows_per_second']} rows/s")
+    return job.to_dict()
 
 
 def main():
-    dialect = engine.dialect.name
-    print(f"Detected dialect: {dialect}")
-    if dialect == "mysql":
-        clear_mysql()
-    elif dialect == "sqlite":
-        clear_sqlite()
-    else:
-        # Fallback: attempt generic deletes
-        with engine.begin() as conn:
-            conn.execute(text("DELETE FROM students"))
-            conn.execute(text("DELETE FROM users"))
-        print(f"Generic: Deleted rows from students and users for dialect '{dialect}'.")
+    user_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    print(f"Detected dialect: {engine.dialect.name}")
+    result = asyncio.run(purge(user_id))
+    if result["status"] != "done":
+        print(f"Purge failed: {result['error']}")
+        sys.exit(1)
+    scope = "all users" if user_id is None else f"user {user_id}"
+    print(
+        f"Purged {scope}: {result['students_deleted']} students and {result['users_deleted']} users "
+        f"in {result['elapsed_seconds']}s ({result['rows_per_second']} rows/s)."
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,25 @@
+"""Create the database schema, indexes, search index and facet summary.
+
+Safe to run repeatedly. Run it once per deploy when the app is started with
+INIT_DB_ON_STARTUP=false, so workers boot without running DDL.
+
+Usage (from backend/app):
+    python scripts/init_db.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import engine
+from migrations import init_db
+from search import search_backend
+
+
+def main():
+    init_db()
+    print(f"Initialised {engine.url.render_as_string(hide_password=True)} (search: {search_backend() or 'ILIKE fallback'})")
+
+
+if __name__ == "__main__":
+    main()
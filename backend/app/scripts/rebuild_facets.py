@@ -0,0 +1,27 @@
+"""Rebuild the per-user course/city facet counts from the students table.
+
+Usage (from backend/app):
+    python scripts/rebuild_facets.py [user_id]
+
+Without a user id every user's facets are rebuilt.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import Base, engine
+from facets import rebuild_facets
+
+
+def main():
+    user_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        written = rebuild_facets(conn, user_id)
+    scope = f"user {user_id}" if user_id is not None else "all users"
+    print(f"Rebuilt facets for {scope}: {written} facet rows written.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import itertools
+import re
+from typing import Optional
+from sqlalchemy import inspect, literal_column, or_, select, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.selectable import Join
+from models import Student
+
+# Full-text backend detected by ensure_search_index: "fts5", "mysql" or None (ILIKE fallback)
+_backend: Optional[str] = None
+
+# InnoDB ignores tokens shorter than innodb_ft_min_token_size (3 by default)
+MYSQL_MIN_TOKEN_SIZE = 3
+
+FTS5_TABLE = "students_fts"
+MYSQL_FULLTEXT_INDEX = "ix_students_fulltext"
+
+_FTS5_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS5_TABLE} USING fts5(
+        name, email, course, city,
+        content='students', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS5_TABLE}_ai AFTER INSERT ON students BEGIN
+        INSERT INTO {FTS5_TABLE}(rowid, name, email, course, city)
+        VALUES (new.id, new.name, new.email, new.course, new.city);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS5_TABLE}_ad AFTER DELETE ON students BEGIN
+        INSERT INTO {FTS5_TABLE}({FTS5_TABLE}, rowid, name, email, course, city)
+        VALUES ('delete', old.id, old.name, old.email, old.course, old.city);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS5_TABLE}_au AFTER UPDATE OF name, email, course, city ON students BEGIN
+        INSERT INTO {FTS5_TABLE}({FTS5_TABLE}, rowid, name, email, course, city)
+        VALUES ('delete', old.id, old.name, old.email, old.course, old.city);
+        INSERT INTO {FTS5_TABLE}(rowid, name, email, course, city)
+        VALUES (new.id, new.name, new.email, new.course, new.city);
+    END
+    """,
+]
+
+
+def ensure_search_index(engine) -> Optional[str]:
+    """Create the full-text index for the current dialect if it is missing.
+
+    The index is maintained by the database itself (FTS5 triggers / InnoDB FULLTEXT),
+    so every write path stays in sync. Returns the detected backend, or None when
+    searches fall back to ILIKE.
+    """
+    global _backend
+    dialect = engine.dialect.name
+
+    if dialect == "sqlite":
+        try:
+            with engine.begin() as conn:
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": FTS5_TABLE}
+                ).first()
+                for statement in _FTS5_DDL:
+                    conn.execute(text(statement))
+                if not exists:
+                    # Index rows that were written before the search table existed
+                    conn.execute(text(f"INSERT INTO {FTS5_TABLE}({FTS5_TABLE}) VALUES ('rebuild')"))
+            _backend = "fts5"
+        except Exception:
+            # SQLite built without FTS5
+            _backend = None
+    elif dialect == "mysql":
+        indexes = {index["name"] for index in inspect(engine).get_indexes("students")}
+        if MYSQL_FULLTEXT_INDEX not in indexes:
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"ALTER TABLE students ADD FULLTEXT INDEX {MYSQL_FULLTEXT_INDEX} (name, email, course, city)"
+                ))
+        _backend = "mysql"
+    else:
+        _backend = None
+
+    return _backend
+
+
+def detect_search_index(engine) -> Optional[str]:
+    """Pick up a full-text index created earlier (e.g. by init-db) without running DDL"""
+    global _backend
+    dialect = engine.dialect.name
+
+    if dialect == "sqlite":
+        with engine.connect() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": FTS5_TABLE}
+            ).first()
+        _backend = "fts5" if exists else None
+    elif dialect == "mysql":
+        indexes = {index["name"] for index in inspect(engine).get_indexes("students")}
+        _backend = "mysql" if MYSQL_FULLTEXT_INDEX in indexes else None
+    else:
+        _backend = None
+
+    return _backend
+
+
+def search_backend() -> Optional[str]:
+    """Return the active full-text backend, or None when using the ILIKE fallback"""
+    return _backend
+
+
+class CrossJoin(Join):
+    """Inner join SQLite keeps in the written order: the left side drives the loop"""
+
+    inherit_cache = True
+
+
+@compiles(CrossJoin)
+def _compile_cross_join(join, compiler, asfrom=False, from_linter=None, **kw):
+    if from_linter:
+        from_linter.edges.update(itertools.product(join.left._from_objects, join.right._from_objects))
+    return (
+        join.left._compiler_dispatch(compiler, asfrom=True, from_linter=from_linter, **kw)
+        + " CROSS JOIN "
+        + join.right._compiler_dispatch(compiler, asfrom=True, from_linter=from_linter, **kw)
+        + " ON "
+        + join.onclause._compiler_dispatch(compiler, from_linter=from_linter, **kw)
+    )
+
+
+def _terms(search: str) -> list[str]:
+    return re.findall(r"\w+", search, re.UNICODE)
+
+
+def apply_search(query, search: str, ranked: bool = False):
+    """Filter a Student query by a search string.
+
+    Returns (query, rank) where rank is a column to ORDER BY ascending for best
+    matches first. rank is None when `ranked` is false or the ILIKE fallback is used.
+    """
+    terms = _terms(search)
+
+    if _backend == "fts5" and terms:
+        # Every term must match, each as a prefix. The match set must drive the
+        # query: joined the other way round, SQLite walks the owner index and
+        # re-runs the MATCH for every row the owner has
+        fts_query = " ".join(f'"{term}"*' for term in terms)
+        match_clause = text(f"{FTS5_TABLE} MATCH :fts_query").bindparams(fts_query=fts_query)
+        if not ranked:
+            matched_ids = select(literal_column("rowid")).select_from(text(FTS5_TABLE)).where(match_clause)
+            return query.where(Student.id.in_(matched_ids)), None
+        matches = (
+            select(literal_column("rowid").label("id"), literal_column("rank").label("rank"))
+            .select_from(text(FTS5_TABLE))
+            .where(match_clause)
+            .subquery("fts")
+        )
+        query = query.select_from(CrossJoin(matches, Student.__table__, matches.c.id == Student.id))
+        return query, matches.c.rank
+
+    if _backend == "mysql" and terms and all(len(term) >= MYSQL_MIN_TOKEN_SIZE for term in terms):
+        relevance = match(
+            Student.name, Student.email, Student.course, Student.city,
+            against=" ".join(f"+{term}*" for term in terms)
+        ).in_boolean_mode()
+        query = query.where(relevance)
+        return query, -relevance
+
+    search_term = f"%{search}%"
+    query = query.where(
+        or_(
+            Student.name.ilike(search_term),
+            Student.email.ilike(search_term),
+            Student.course.ilike(search_term),
+            Student.city.ilike(search_term)
+        )
+    )
+    return query, None
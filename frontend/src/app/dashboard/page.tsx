@@ -4,9 +4,10 @@ import React, { useState, useEffect } from 'react';
 import { motion } from 'framer-motion';
 import { DashboardLayout, ProtectedRoute } from '@/components/layout';
 import { Card, Button, Spinner, Badge } from '@/components/ui';
-import { studentsApi, Student } from '@/lib/api';
+import { studentsApi, subscribeToStudentEvents, Student } from '@/lib/api';
 import { useAuth } from '@/contexts/AuthContext';
 import { useRouter } from 'next/navigation';
+import { debounce } from '@/lib/utils';
 import { 
   Users, 
   BookOpen, 
@@ -40,18 +41,14 @@ export default function DashboardPage() {
   useEffect(() => {
     const fetchDashboardData = async () => {
       try {
-        const [studentsRes, courses, cities] = await Promise.all([
-          studentsApi.getAll({ page: 1, page_size: 5, sort_by: 'id', sort_order: 'desc' }),
-          studentsApi.getCourses(),
-          studentsApi.getCities(),
-        ]);
+        const summary = await studentsApi.getSummary({ recent: 5 });
 
         setStats({
-          totalStudents: studentsRes.total,
-          totalCourses: courses.length,
-          totalCities: cities.length,
+          totalStudents: summary.total,
+          totalCourses: summary.course_count,
+          totalCities: summary.city_count,
         });
-        setRecentStudents(studentsRes.students);
+        setRecentStudents(summary.recent);
       } catch (error) {
         console.error('Failed to fetch dashboard data:', error);
       } finally {
@@ -60,6 +57,7 @@ export default function DashboardPage() {
     };
 
     fetchDashboardData();
+    return subscribeToStudentEvents(debounce(fetchDashboardData, 300));
   }, []);
 
   const statCards = [
@@ -1,6 +1,6 @@
 'use client';
 
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { DashboardLayout, ProtectedRoute } from '@/components/layout';
 import { 
@@ -12,7 +12,7 @@ import {
   SkeletonCard
 } from '@/components/ui';
 import { StudentForm, StudentCard, StudentTable, StudentFilters } from '@/components/students';
-import { studentsApi, Student, StudentData } from '@/lib/api';
+import { studentsApi, subscribeToStudentEvents, Student, StudentData } from '@/lib/api';
 import { useToast } from '@/contexts/ToastContext';
 import { debounce } from '@/lib/utils';
 import { Plus, LayoutGrid, List, Users } from 'lucide-react';
@@ -57,8 +57,8 @@ export default function StudentsPage() {
   const [isDeleting, setIsDeleting] = useState(false);
 
   // Fetch students
-  const fetchStudents = useCallback(async () => {
-    setIsLoading(true);
+  const fetchStudents = useCallback(async (quiet = false) => {
+    if (!quiet) setIsLoading(true);
     try {
       const response = await studentsApi.getAll({
         page: currentPage,
@@ -102,6 +102,18 @@ export default function StudentsPage() {
     fetchFilterOptions();
   }, [fetchFilterOptions]);
 
+  // Refresh when students change in another tab or session; the ref keeps one
+  // stream open across filter and page changes
+  const refreshRef = useRef(() => {});
+  refreshRef.current = () => {
+    fetchStudents(true);
+    fetchFilterOptions();
+  };
+
+  useEffect(() => {
+    return subscribeToStudentEvents(debounce(() => refreshRef.current(), 300));
+  }, []);
+
   // Debounced search
   const debouncedSearch = useCallback(
     debounce((value: string) => {
@@ -63,6 +63,30 @@ export interface StudentListResponse {
   page: number;
   page_size: number;
   total_pages: number;
+  next_cursor?: string | null;
+  prev_cursor?: string | null;
+}
+
+export interface StudentBatchResponse {
+  results: { id: number; found: boolean; student: Student | null }[];
+  missing: number[];
+}
+
+export interface StudentSummary {
+  total: number;
+  course_count: number;
+  city_count: number;
+  top_courses: { value: string; count: number }[];
+  top_cities: { value: string; count: number }[];
+  age_histogram: { min_age: number; max_age: number; count: number }[];
+  recent: Student[];
+}
+
+export interface StudentChangeEvent {
+  type: 'created' | 'updated' | 'deleted' | 'reset';
+  ids: number[] | null;
+  count: number | null;
+  version: string;
 }
 
 export interface LoginCredentials {
@@ -114,6 +138,7 @@ export const authApi = {
 // Students API
 export interface StudentQueryParams {
   page?: number;
+  cursor?: string;
   page_size?: number;
   search?: string;
   course?: string;
@@ -138,6 +163,11 @@ export const studentsApi = {
     return response.data;
   },
   
+  getByIds: async (ids: number[]) => {
+    const response = await api.post<StudentBatchResponse>('/students/batch', { ids });
+    return response.data;
+  },
+  
   create: async (data: StudentData) => {
     const response = await api.post<Student>('/students', data);
     return response.data;
@@ -153,6 +183,11 @@ export const studentsApi = {
     return response.data;
   },
   
+  getSummary: async (params?: { top?: number; recent?: number; age_bucket?: number }) => {
+    const response = await api.get<StudentSummary>('/students/summary', { params });
+    return response.data;
+  },
+  
   getCourses: async () => {
     const response = await api.get<string[]>('/students/courses');
     return response.data;
@@ -164,4 +199,71 @@ export const studentsApi = {
   },
 };
 
+const MAX_EVENTS_BACKOFF_MS = 5 * 60 * 1000;
+
+// Live student changes over server-sent events. EventSource cannot send the
+// bearer token, so the stream is read with fetch; reconnects resume from the
+// last event id. Refusals (429/503) and errors back off exponentially, never
+// sooner than Retry-After. Returns a function that closes the stream.
+export function subscribeToStudentEvents(onEvent: (event: StudentChangeEvent) => void): () => void {
+  const controller = new AbortController();
+  let lastEventId = '';
+  let retryMs = 3000;
+  let failures = 0;
+
+  const backoff = (retryAfterSeconds = 0) => {
+    failures += 1;
+    const exponential = Math.min(retryMs * 2 ** (failures - 1), MAX_EVENTS_BACKOFF_MS);
+    return Math.max(retryAfterSeconds * 1000, exponential) * (1 + Math.random() * 0.2);
+  };
+
+  // Resolves to the delay before reconnecting, or null to stop
+  const connect = async (): Promise<number | null> => {
+    const token = localStorage.getItem('token');
+    if (!token) return null;
+    const headers: Record<string, string> = { Authorization: `Bearer ${token}` };
+    if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+
+    const response = await fetch(`${API_URL}/students/events`, { headers, signal: controller.signal });
+    if (response.status === 401 || response.status === 403) return null;
+    if (response.status === 429 || response.status === 503) {
+      return backoff(Number(response.headers.get('Retry-After')) || 0);
+    }
+    if (!response.ok || !response.body) return backoff();
+    failures = 0;
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) return retryMs + Math.random() * 1000;
+      buffer += value.replace(/\r\n?/g, '\n');
+      let end: number;
+      while ((end = buffer.indexOf('\n\n')) !== -1) {
+        const frame = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        let data = '';
+        for (const line of frame.split('\n')) {
+          if (line.startsWith('id:')) lastEventId = line.slice(3).trim();
+          else if (line.startsWith('data:')) data += line.slice(5).trim();
+          else if (line.startsWith('retry:')) retryMs = Number(line.slice(6)) || retryMs;
+        }
+        if (data) onEvent(JSON.parse(data));
+      }
+    }
+  };
+
+  const run = async () => {
+    while (!controller.signal.aborted) {
+      // A network error or server restart backs off like a refusal
+      const delay = await connect().catch(() => backoff());
+      if (delay === null || controller.signal.aborted) return;
+      await new Promise((resolve) => setTimeout(resolve, delay));
+    }
+  };
+
+  run();
+  return () => controller.abort();
+}
+
 export default api;